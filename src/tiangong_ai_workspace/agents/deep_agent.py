@@ -4,14 +4,18 @@ Workspace-specialised autonomous agent built with LangGraph.
 The agent coordinates shell execution, Python scripting, Tavily research, and
 document drafting tools. It follows a lightweight ReAct-style loop that plans an
 action, executes the selected tool, and reasons over observations until it
-produces a final answer.
+produces a final answer. Independent tool calls planned together are fanned out
+with LangGraph ``Send`` and gathered back in plan order before the next step.
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
-from dataclasses import dataclass
-from typing import Any, Callable, Mapping, MutableMapping, Sequence, TypedDict
+import sys
+from dataclasses import dataclass, replace
+from functools import lru_cache
+from typing import Annotated, Any, Callable, Final, Mapping, MutableMapping, Sequence, TypedDict
 
 from deepagents import create_deep_agent
 from langchain_core.language_models.chat_models import BaseChatModel
@@ -20,11 +24,13 @@ from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import Runnable
 from langgraph.graph import END, StateGraph
+from langgraph.types import Send
 
+from ..tooling.aio import run_sync
 from ..tooling.dify import DifyKnowledgeBaseError
 from ..tooling.llm import ModelRouter
 from ..tooling.neo4j import Neo4jToolError
-from ..tooling.tavily import TavilySearchClient, TavilySearchError
+from ..tooling.tavily import TavilySearchClient
 from .tools import (
     create_crossref_tool,
     create_dify_knowledge_tool,
@@ -36,7 +42,14 @@ from .tools import (
     create_tavily_tool,
 )
 
-__all__ = ["build_workspace_deep_agent", "WorkspaceAgentConfig"]
+__all__ = ["build_workspace_deep_agent", "SubagentSpec", "WorkspaceAgentConfig"]
+
+
+def _merge_parallel_results(current: list[tuple[int, str, str]] | None, update: list[tuple[int, str, str]] | None) -> list[tuple[int, str, str]]:
+    # ``None`` resets the channel once the aggregator has consumed a fan-out round.
+    if update is None:
+        return []
+    return [*(current or []), *update]
 
 
 class WorkspaceAgentState(TypedDict, total=False):
@@ -49,6 +62,16 @@ class WorkspaceAgentState(TypedDict, total=False):
     thought: str
     last_observation: str
     final_response: str
+    parallel_actions: list[tuple[str, Any]]
+    parallel_results: Annotated[list[tuple[int, str, str]], _merge_parallel_results]
+
+
+class _DispatchState(TypedDict):
+    """Payload sent to a single fan-out worker."""
+
+    index: int
+    action: str
+    action_input: Any
 
 
 @dataclass(slots=True)
@@ -59,17 +82,98 @@ class WorkspaceAgentConfig:
     system_prompt: str | None = None
 
 
+@dataclass(slots=True, frozen=True)
+class SubagentSpec:
+    """
+    Declarative description of a specialist subagent for the deepagents engine.
+
+    Specs are materialised into the ``SubAgent`` mappings expected by
+    ``create_deep_agent`` only once, when the agent is compiled. `model` is kept by
+    reference, so every spec built from the same chat model shares one client.
+    """
+
+    name: str
+    description: str
+    system_prompt: str
+    tools: tuple[Any, ...] = ()
+    model: BaseChatModel | str | None = None
+
+    def to_subagent(self) -> dict[str, Any]:
+        subagent: dict[str, Any] = {
+            "name": self.name,
+            "description": self.description,
+            "system_prompt": self.system_prompt,
+            "tools": list(self.tools),
+        }
+        if self.model is not None:
+            subagent["model"] = self.model
+        return subagent
+
+
 _TOOL_SENTINEL = "Available tools: shell, python, tavily, crossref, openalex_work, openalex_cited_by, document, neo4j, knowledge."
 
-DEFAULT_SYSTEM_PROMPT = f"""You are the TianGong Workspace orchestrator.
+DEFAULT_SYSTEM_PROMPT: Final[str] = f"""You are the TianGong Workspace orchestrator.
 - Plan multi-step solutions and choose the best tool for each step.
 - {_TOOL_SENTINEL} Use shell/python for code or CLI tasks, tavily for web research, document for structured drafts.
 - Think step-by-step. When you decide to finish, return a concise, helpful summary of the work performed.
 - Always respond using JSON with keys: thought, action, input, final_response (only set when action is \"finish\")."""
 
 TOOL_FALLBACK_MESSAGE = "An internal error occurred while running tool '{action}'. Include any partial results and continue."
+PARALLEL_ACTION = "parallel"
+# PythonExecutor redirects the process-wide sys.stdout and arms SIGALRM, which only
+# works on the main thread, so these tools never join a fan-out; the aggregate step
+# runs them one after another instead.
+_SEQUENTIAL_TOOLS: Final[frozenset[str]] = frozenset({"python"})
 SUPPORTED_ENGINES = {"langgraph", "deepagents"}
 
+# Opt-in deepagents specialists (``include_specialists=True``), built once at import.
+# Per-agent copies only swap in the enabled tools and the shared chat model via
+# ``dataclasses.replace``.
+_RESEARCH_SPEC: Final[SubagentSpec] = SubagentSpec(
+    name=sys.intern("researcher"),
+    description=sys.intern("Gathers evidence from the web, the knowledge base, and scholarly indexes; delegate literature and fact-finding tasks."),
+    system_prompt=sys.intern("You are a research specialist. Collect sources relevant to the task, cite them, and return a concise evidence summary."),
+)
+_WRITER_SPEC: Final[SubagentSpec] = SubagentSpec(
+    name=sys.intern("writer"),
+    description=sys.intern("Drafts structured documents such as reports, plans, patent disclosures, and proposals."),
+    system_prompt=sys.intern("You are a document specialist. Produce well-structured drafts with the document tool and return the final text."),
+)
+_EXECUTOR_SPEC: Final[SubagentSpec] = SubagentSpec(
+    name=sys.intern("executor"),
+    description=sys.intern("Runs shell commands, Python snippets, and Cypher queries; delegate data processing and verification steps."),
+    system_prompt=sys.intern("You are an execution specialist. Run the minimal commands needed, check their output, and report results precisely."),
+)
+_SPECIALIST_SUBAGENTS: Final[tuple[tuple[SubagentSpec, tuple[str, ...]], ...]] = (
+    (_RESEARCH_SPEC, ("tavily", "knowledge", "crossref", "openalex_work", "openalex_cited_by")),
+    (_WRITER_SPEC, ("document",)),
+    (_EXECUTOR_SPEC, ("shell", "python", "neo4j")),
+)
+
+
+@dataclass(slots=True, frozen=True)
+class _ToolSpec:
+    """How one `include_*` flag maps onto tool names and the factory building them."""
+
+    flag: str
+    names: tuple[str, ...]
+    factory: Callable[[], Any]
+    skipped: tuple[type[Exception], ...] = ()
+    available: Callable[[], bool] | None = None
+
+
+_TOOL_SPECS: Final[tuple[_ToolSpec, ...]] = (
+    _ToolSpec("include_shell", ("shell",), create_shell_tool),
+    _ToolSpec("include_python", ("python",), create_python_tool),
+    # Skip Tavily if secrets are missing; agent can still operate offline.
+    _ToolSpec("include_tavily", ("tavily",), create_tavily_tool, available=TavilySearchClient.is_configured),
+    _ToolSpec("include_dify_knowledge", ("knowledge",), create_dify_knowledge_tool, (DifyKnowledgeBaseError,)),
+    _ToolSpec("include_document_agent", ("document",), create_document_tool),
+    _ToolSpec("include_neo4j", ("neo4j",), create_neo4j_tool, (Neo4jToolError,)),
+    _ToolSpec("include_crossref", ("crossref",), create_crossref_tool),
+    _ToolSpec("include_openalex", ("openalex_work", "openalex_cited_by"), create_openalex_tools),
+)
+
 
 def build_workspace_deep_agent(
     *,
@@ -86,6 +190,8 @@ def build_workspace_deep_agent(
     system_prompt: str | None = None,
     max_iterations: int = 8,
     engine: str = "langgraph",
+    subagents: Sequence[SubagentSpec] | None = None,
+    include_specialists: bool = False,
 ) -> Any:
     """
     Construct and compile the workspace autonomous agent.
@@ -103,6 +209,12 @@ def build_workspace_deep_agent(
         Custom system instructions appended to the default planner guidance.
     max_iterations:
         Safety limit on the number of planning cycles before the agent returns.
+    subagents:
+        Specialist subagents for the deepagents engine. None (the default) means
+        no delegation.
+    include_specialists:
+        Also give the deepagents engine the built-in researcher, writer, and
+        executor subagents, each wired to whichever of its tools are enabled.
     """
 
     planner_llm = _resolve_planner_llm(llm=llm, model=model)
@@ -128,7 +240,10 @@ def build_workspace_deep_agent(
 
     if engine_choice == "deepagents":
         chat_model = _require_chat_model(planner_llm)
-        return _build_deepagents_agent(chat_model, tools, config, tool_list)
+        specs = list(subagents or ())
+        if include_specialists:
+            specs.extend(_specialist_subagents(chat_model, tools))
+        return _build_deepagents_agent(chat_model, tools, config, tool_list, specs)
 
     return _build_langgraph_agent(planner_llm, tools, config, tool_list)
 
@@ -144,39 +259,39 @@ def _initialise_tools(
     include_crossref: bool,
     include_openalex: bool,
 ) -> Mapping[str, Any]:
+    flags = {
+        "include_shell": include_shell,
+        "include_python": include_python,
+        "include_tavily": include_tavily,
+        "include_document_agent": include_document_agent,
+        "include_dify_knowledge": include_dify_knowledge,
+        "include_neo4j": include_neo4j,
+        "include_crossref": include_crossref,
+        "include_openalex": include_openalex,
+    }
+    return run_sync(_ainitialise_tools(flags))
+
+
+async def _ainitialise_tools(flags: Mapping[str, bool]) -> Mapping[str, Any]:
+    # Tool factories load secrets and construct clients independently, so build them
+    # concurrently; startup then costs the slowest factory instead of the sum.
+    specs = [spec for spec in _TOOL_SPECS if flags[spec.flag] and (spec.available is None or spec.available())]
+    built = await asyncio.gather(*(asyncio.to_thread(_build_optional_tool, spec.factory, spec.skipped) for spec in specs))
+
     tool_mapping: MutableMapping[str, Any] = {}
+    for spec, result in zip(specs, built):
+        if result is None:
+            continue
+        values = result if len(spec.names) > 1 else (result,)
+        tool_mapping.update(zip(spec.names, values))
+    return tool_mapping
 
-    if include_shell:
-        tool_mapping["shell"] = create_shell_tool()
-    if include_python:
-        tool_mapping["python"] = create_python_tool()
-    if include_tavily:
-        try:
-            TavilySearchClient()  # validate configuration early
-            tool_mapping["tavily"] = create_tavily_tool()
-        except TavilySearchError:
-            # Skip Tavily if secrets are missing; agent can still operate offline.
-            pass
-    if include_dify_knowledge:
-        try:
-            tool_mapping["knowledge"] = create_dify_knowledge_tool()
-        except DifyKnowledgeBaseError:
-            pass
-    if include_document_agent:
-        tool_mapping["document"] = create_document_tool()
-    if include_neo4j:
-        try:
-            tool_mapping["neo4j"] = create_neo4j_tool()
-        except Neo4jToolError:
-            pass
-    if include_crossref:
-        tool_mapping["crossref"] = create_crossref_tool()
-    if include_openalex:
-        work_tool, cited_by_tool = create_openalex_tools()
-        tool_mapping["openalex_work"] = work_tool
-        tool_mapping["openalex_cited_by"] = cited_by_tool
 
-    return tool_mapping
+def _build_optional_tool(factory: Callable[[], Any], skipped: tuple[type[Exception], ...]) -> Any:
+    try:
+        return factory()
+    except skipped:
+        return None
 
 
 def _resolve_planner_llm(*, llm: Runnable | None, model: Any | None) -> Runnable:
@@ -204,10 +319,14 @@ def _build_langgraph_agent(
     graph = StateGraph(WorkspaceAgentState)
     graph.add_node("plan", _make_plan_node(planner, config, tools))
     graph.add_node("act", _make_action_node(tools))
+    graph.add_node("dispatch", _make_dispatch_node(tools), input_schema=_DispatchState)
+    graph.add_node("aggregate", _make_aggregate_node(tools))
     graph.set_entry_point("plan")
 
     graph.add_conditional_edges("plan", _make_plan_router(tools, config))
     graph.add_edge("act", "plan")
+    graph.add_edge("dispatch", "aggregate")
+    graph.add_edge("aggregate", "plan")
 
     return graph.compile()
 
@@ -217,15 +336,28 @@ def _build_deepagents_agent(
     tools: Mapping[str, Any],
     config: WorkspaceAgentConfig,
     tool_list: str,
+    subagents: Sequence[SubagentSpec],
 ) -> Any:
     system_prompt = _compose_system_prompt(tool_list, config.system_prompt)
+    if not subagents:
+        return create_deep_agent(model=planner_llm, tools=list(tools.values()), system_prompt=system_prompt)
     return create_deep_agent(
         model=planner_llm,
         tools=list(tools.values()),
         system_prompt=system_prompt,
+        subagents=[spec.to_subagent() for spec in subagents],
     )
 
 
+def _specialist_subagents(model: BaseChatModel, tools: Mapping[str, Any]) -> list[SubagentSpec]:
+    specs: list[SubagentSpec] = []
+    for template, tool_names in _SPECIALIST_SUBAGENTS:
+        available = tuple(tools[tool_name] for tool_name in tool_names if tool_name in tools)
+        if available:
+            specs.append(replace(template, tools=available, model=model))
+    return specs
+
+
 def _describe_tools(tools: Mapping[str, Any]) -> str:
     if not tools:
         return "- finish: provide the final answer (no tools available)."
@@ -265,7 +397,9 @@ def _build_planner_chain(
                     '  "final_response": "<only when action is finish>"\n'
                     "}}\n"
                     "```\n"
-                    "If you choose a tool, ensure `input` matches its expected parameters."
+                    "If you choose a tool, ensure `input` matches its expected parameters.\n"
+                    'To run independent tool calls concurrently, set "action" to "parallel" and "input" to a list of '
+                    '{{"action": "<tool>", "input": <arguments>}} objects; use single actions when steps depend on each other.'
                 ),
             ),
         ]
@@ -274,6 +408,7 @@ def _build_planner_chain(
     return prompt | planner_llm | StrOutputParser()
 
 
+@lru_cache(maxsize=32)
 def _compose_system_prompt(tool_list: str, custom_prompt: str | None) -> str:
     base = DEFAULT_SYSTEM_PROMPT.replace(_TOOL_SENTINEL, f"Available tools:\n{tool_list}")
     if custom_prompt:
@@ -298,7 +433,8 @@ def _make_plan_node(
         action_input = plan.get("input")
         thought = plan.get("thought") or response_text
 
-        if action not in {*tools.keys(), "finish"}:
+        parallel_actions = _parse_parallel_actions(action_input, tools) if action == PARALLEL_ACTION else []
+        if action not in {*tools.keys(), "finish"} and not parallel_actions:
             action = "finish"
             plan["final_response"] = plan.get("final_response") or f"Unsupported action '{plan.get('action')}'. Provide the best possible summary instead."
 
@@ -311,6 +447,7 @@ def _make_plan_node(
             "action": action,
             "action_input": action_input,
             "thought": thought,
+            "parallel_actions": parallel_actions,
         }
 
         if action == "finish" or iterations >= config.max_iterations:
@@ -338,18 +475,10 @@ def _make_action_node(tools: Mapping[str, Any]) -> Callable[[WorkspaceAgentState
                 "action": "finish",
             }
 
-        action_input = state.get("action_input")
-        invocation = _normalise_tool_input(action_input)
-
-        try:
-            result = tool.invoke(invocation)
-        except Exception as exc:  # pragma: no cover - defensive fallback
-            observation = TOOL_FALLBACK_MESSAGE.format(action=action) + f" Error: {exc}"
-        else:
-            observation = _render_observation(result)
+        observation = _invoke_tool(tool, action, state.get("action_input"))
 
         messages = list(state.get("messages", []))
-        messages.append(ToolMessage(content=observation, name=action))
+        messages.append(ToolMessage(content=observation, name=action, tool_call_id=action))
 
         return {
             **state,
@@ -362,16 +491,54 @@ def _make_action_node(tools: Mapping[str, Any]) -> Callable[[WorkspaceAgentState
     return act_node
 
 
+def _make_dispatch_node(tools: Mapping[str, Any]) -> Callable[[_DispatchState], WorkspaceAgentState]:
+    def dispatch_node(task: _DispatchState) -> WorkspaceAgentState:
+        action = task["action"]
+        observation = _invoke_tool(tools[action], action, task["action_input"])
+        return {"parallel_results": [(task["index"], action, observation)]}
+
+    return dispatch_node
+
+
+def _make_aggregate_node(tools: Mapping[str, Any]) -> Callable[[WorkspaceAgentState], WorkspaceAgentState]:
+    def aggregate_node(state: WorkspaceAgentState) -> WorkspaceAgentState:
+        results = list(state.get("parallel_results") or [])
+        for index, (action, action_input) in enumerate(state.get("parallel_actions") or []):
+            if action in _SEQUENTIAL_TOOLS:
+                results.append((index, action, _invoke_tool(tools[action], action, action_input)))
+        results.sort(key=lambda item: item[0])
+        messages = list(state.get("messages", []))
+        messages.extend(ToolMessage(content=observation, name=action, tool_call_id=f"{action}-{index}") for index, action, observation in results)
+        return {
+            **state,
+            "messages": messages,
+            "action": None,
+            "action_input": None,
+            "parallel_actions": [],
+            "parallel_results": None,
+            "last_observation": "\n\n".join(observation for _, _, observation in results),
+        }
+
+    return aggregate_node
+
+
 def _make_plan_router(
     tools: Mapping[str, Any],
     config: WorkspaceAgentConfig,
-) -> Callable[[WorkspaceAgentState], str]:
-    def router(state: WorkspaceAgentState) -> str:
+) -> Callable[[WorkspaceAgentState], str | list[Send]]:
+    def router(state: WorkspaceAgentState) -> str | list[Send]:
         action = state.get("action")
         iterations = state.get("iterations", 0)
 
         if action == "finish" or iterations >= config.max_iterations:
             return END
+        if action == PARALLEL_ACTION:
+            sends = [
+                Send("dispatch", {"index": index, "action": name, "action_input": action_input})
+                for index, (name, action_input) in enumerate(state.get("parallel_actions") or [])
+                if name not in _SEQUENTIAL_TOOLS
+            ]
+            return sends or "aggregate"
         if action not in tools:
             return END
         return "act"
@@ -379,6 +546,24 @@ def _make_plan_router(
     return router
 
 
+def _parse_parallel_actions(action_input: Any, tools: Mapping[str, Any]) -> list[tuple[str, Any]]:
+    if not isinstance(action_input, Sequence) or isinstance(action_input, (str, bytes)):
+        return []
+    actions: list[tuple[str, Any]] = []
+    for entry in action_input:
+        if isinstance(entry, Mapping) and entry.get("action") in tools:
+            actions.append((str(entry["action"]), entry.get("input")))
+    return actions
+
+
+def _invoke_tool(tool: Any, action: str, action_input: Any) -> str:
+    try:
+        result = tool.invoke(_normalise_tool_input(action_input))
+    except Exception as exc:  # pragma: no cover - defensive fallback
+        return TOOL_FALLBACK_MESSAGE.format(action=action) + f" Error: {exc}"
+    return _render_observation(result)
+
+
 def _normalise_tool_input(action_input: Any) -> Any:
     if action_input is None:
         return {}
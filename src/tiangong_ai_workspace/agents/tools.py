@@ -4,16 +4,18 @@ LangChain tool definitions that expose workspace capabilities to agents.
 
 from __future__ import annotations
 
-from typing import Any, Mapping, Optional, Sequence
+from typing import Any, Callable, Mapping, Optional, Sequence
 
 from langchain_core.tools import tool
 from pydantic import BaseModel
 
+from ..tooling.aio import run_sync
 from ..tooling.crossref import CrossrefClient, CrossrefClientError
 from ..tooling.dify import DifyKnowledgeBaseClient, DifyKnowledgeBaseError
 from ..tooling.executors import PythonExecutor, ShellExecutor
 from ..tooling.neo4j import Neo4jClient, Neo4jToolError
 from ..tooling.openalex import OpenAlexClient, OpenAlexClientError
+from ..tooling.semantic_cache import LLMSemanticCache
 from ..tooling.tavily import TavilySearchClient, TavilySearchError
 from ..tooling.tool_schemas import (
     CrossrefJournalWorksInput,
@@ -31,10 +33,8 @@ from ..tooling.tool_schemas import (
     OpenAlexWorkLookupInput,
     OpenAlexWorkLookupOutput,
     PythonCommandInput,
-    PythonCommandOutput,
     RetrievalModelInput,
     ShellCommandInput,
-    ShellCommandOutput,
     TavilySearchInput,
     TavilySearchOutput,
 )
@@ -52,16 +52,22 @@ __all__ = [
 ]
 
 
-def create_shell_tool(executor: Optional[ShellExecutor] = None, *, name: str = "run_shell") -> Any:
+def create_shell_tool(
+    executor: Optional[ShellExecutor] = None,
+    *,
+    name: str = "run_shell",
+    on_stdout: Optional[Callable[[str], None]] = None,
+    on_stderr: Optional[Callable[[str], None]] = None,
+) -> Any:
     exec_instance = executor or ShellExecutor()
 
     @tool(name, args_schema=ShellCommandInput)
     def run_shell(command: str, timeout: int | None = None) -> Mapping[str, Any]:
         """Execute a shell command inside the workspace environment."""
 
-        result = exec_instance.run(command, timeout=timeout)
-        payload = ShellCommandOutput(**result.to_dict())
-        return payload.model_dump()
+        result = exec_instance.run(command, timeout=timeout, on_stdout=on_stdout, on_stderr=on_stderr)
+        # The msgspec struct already matches ShellCommandOutput, so skip a pydantic round trip.
+        return result.to_dict()
 
     return run_shell
 
@@ -74,8 +80,7 @@ def create_python_tool(executor: Optional[PythonExecutor] = None, *, name: str =
         """Execute Python code using the shared workspace interpreter."""
 
         result = exec_instance.run(code)
-        payload = PythonCommandOutput(**result.to_dict())
-        return payload.model_dump()
+        return result.to_dict()
 
     return run_python
 
@@ -84,9 +89,11 @@ def create_tavily_tool(client: Optional[TavilySearchClient] = None, *, name: str
     tavily_client = client or TavilySearchClient()
 
     @tool(name, args_schema=TavilySearchInput)
-    def tavily_search(query: str, options: Optional[Mapping[str, Any]] = None) -> Mapping[str, Any]:
+    def tavily_search(query: str | list[str], options: Optional[Mapping[str, Any]] = None) -> Mapping[str, Any]:
         """Search the internet using the configured Tavily MCP service."""
 
+        if not isinstance(query, str):
+            return _batch_tavily_search(tavily_client, query, dict(options or {}))
         try:
             result = tavily_client.search(query, options=dict(options or {}))
         except TavilySearchError as exc:
@@ -98,6 +105,27 @@ def create_tavily_tool(client: Optional[TavilySearchClient] = None, *, name: str
     return tavily_search
 
 
+def _batch_tavily_search(client: TavilySearchClient, queries: Sequence[str], options: Mapping[str, Any]) -> Mapping[str, Any]:
+    # Independent sub-queries share one event loop instead of running one after another;
+    # a failing sub-query becomes an error entry rather than discarding the others.
+    outcomes = run_sync(client.batch_search(queries, options=options, return_exceptions=True))
+    results: list[Mapping[str, Any]] = []
+    failures: list[str] = []
+    for query, outcome in zip(queries, outcomes):
+        if isinstance(outcome, TavilySearchError):
+            failures.append(f"{query}: {outcome}")
+            results.append({"query": query, "status": "error", "message": str(outcome)})
+        elif isinstance(outcome, BaseException):
+            raise outcome
+        else:
+            results.append(outcome)
+    if failures and len(failures) == len(results):
+        payload = TavilySearchOutput(status="error", data={"results": results}, message="; ".join(failures))
+    else:
+        payload = TavilySearchOutput(status="success", data={"results": results}, message="; ".join(failures) or None)
+    return payload.model_dump()
+
+
 def create_dify_knowledge_tool(client: Optional[DifyKnowledgeBaseClient] = None, *, name: str = "dify_knowledge") -> Any:
     kb_client = client or DifyKnowledgeBaseClient()
 
@@ -138,7 +166,7 @@ def create_dify_knowledge_tool(client: Optional[DifyKnowledgeBaseClient] = None,
                 top_k=top_k,
                 retrieval_model=retrieval_payload,
                 metadata_filters=metadata_payload,
-                options=dict(options or {}),
+                options=options,
             )
         except DifyKnowledgeBaseError as exc:
             payload = DifyKnowledgeBaseOutput(status="error", message=str(exc))
@@ -174,7 +202,7 @@ def create_neo4j_tool(client: Optional[Neo4jClient] = None, *, name: str = "run_
     return run_neo4j_query
 
 
-def create_document_tool(*, name: str = "generate_document") -> Any:
+def create_document_tool(*, name: str = "generate_document", cache: Optional[LLMSemanticCache] = None) -> Any:
     @tool(name, args_schema=DocumentToolInput)
     def generate_document(
         workflow: str,
@@ -200,7 +228,16 @@ def create_document_tool(*, name: str = "generate_document") -> Any:
             language=language,
             include_research=not skip_research,
         )
-        result = run_document_workflow(config)
+        if cache is None:
+            result = run_document_workflow(config)
+        else:
+            scope = {"workflow": workflow, "audience": audience, "language": language, "skip_research": skip_research}
+            result = cache.get_or_compute(
+                {**scope, "topic": topic, "instructions": instructions},
+                lambda: run_document_workflow(config),
+                text="\n".join(filter(None, (topic, instructions))),
+                scope=scope,
+            )
         payload = DocumentToolOutput(status="success", data=result)
         return payload.model_dump()
 
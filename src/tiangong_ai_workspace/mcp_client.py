@@ -4,7 +4,8 @@ Synchronous bridge for interacting with Model Context Protocol servers.
 This helper mirrors the usage patterns captured in the TianGong LCA spec coding
 repository but is adapted for the Tiangong AI Workspace CLI. It provides a thin
 wrapper over the official ``mcp`` Python SDK so callers can interact with remote
-MCP tools without juggling async event loops directly.
+MCP tools without juggling async event loops directly. Async callers can use
+:func:`ainvoke_tool` to issue many tool calls concurrently on one event loop.
 """
 
 from __future__ import annotations
@@ -117,23 +118,30 @@ class MCPToolClient:
             result = self._portal.call(connection.session.call_tool, tool_name, args)
         except (McpError, HTTPStatusError) as exc:
             raise RuntimeError(f"MCP tool '{tool_name}' on '{service_name}' failed") from exc
+        return self._unpack_result(service_name, tool_name, result)
 
+    # ------------------------------------------------------------------ internals
+
+    @staticmethod
+    def _unpack_result(
+        service_name: str,
+        tool_name: str,
+        result: types.CallToolResult,
+    ) -> tuple[Any, Optional[list[dict[str, Any]]]]:
         if result.isError:
-            message = self._collect_text(result) or "Unknown MCP tool error"
+            message = MCPToolClient._collect_text(result) or "Unknown MCP tool error"
             raise RuntimeError(f"MCP tool '{tool_name}' on '{service_name}' reported an error: {message}")
 
         payload = result.structuredContent
         if payload is None:
-            payload = self._collect_text_blocks(result)
+            payload = MCPToolClient._collect_text_blocks(result)
             if not payload:
                 payload = ""
             elif len(payload) == 1:
                 payload = payload[0]
-        attachments = self._collect_attachments(result)
+        attachments = MCPToolClient._collect_attachments(result)
         return payload, attachments or None
 
-    # ------------------------------------------------------------------ internals
-
     def _ensure_connection(self, service_name: str) -> _ServerConnection:
         if self._closed:
             raise RuntimeError("Cannot use MCPToolClient after close()")
@@ -206,4 +214,34 @@ class MCPToolClient:
         return attachments
 
 
-__all__ = ["MCPToolClient"]
+async def ainvoke_tool(
+    config: MCPServerSecrets,
+    tool_name: str,
+    arguments: Mapping[str, Any] | None = None,
+) -> tuple[Any, Optional[list[dict[str, Any]]]]:
+    """
+    Invoke a remote tool from async code using a short-lived MCP session.
+
+    Unlike :class:`MCPToolClient`, no blocking portal is involved, so many calls
+    can share one event loop (e.g. via ``asyncio.gather``).
+    """
+
+    if config.transport != "streamable_http":
+        raise ValueError(f"Unsupported MCP transport '{config.transport}' for service '{config.service_name}'.")
+
+    payload = config.connection_payload()
+    async with streamablehttp_client(
+        payload["url"],
+        headers=payload.get("headers"),
+        timeout=payload.get("timeout"),
+    ) as (read_stream, write_stream, _):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+            try:
+                result = await session.call_tool(tool_name, dict(arguments or {}))
+            except (McpError, HTTPStatusError) as exc:
+                raise RuntimeError(f"MCP tool '{tool_name}' on '{config.service_name}' failed") from exc
+    return MCPToolClient._unpack_result(config.service_name, tool_name, result)
+
+
+__all__ = ["MCPToolClient", "ainvoke_tool"]
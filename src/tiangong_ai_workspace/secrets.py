@@ -4,22 +4,29 @@ Secrets loading utilities for the Tiangong AI Workspace.
 This module centralises reading the local `.sercrets/secrets.toml` file so other
 packages (such as CLI tools or MCP helpers) can obtain configuration without
 needing to know the on-disk layout. The loader mirrors the structure defined in
-`.sercrets/secrets.example.toml`.
+`.sercrets/secrets.example.toml`. Parsed results are memoised per file (and
+invalidated when the file changes), so clients constructed without explicit
+secrets share one immutable :class:`Secrets` instance instead of re-reading TOML.
 """
 
 from __future__ import annotations
 
 import os
+import threading
 import tomllib
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any, Dict, Mapping, MutableMapping, Optional
 
 WORKSPACE_ROOT = Path(__file__).resolve().parents[2]
 DEFAULT_SECRETS_PATH = Path(os.environ.get("TIANGONG_SECRETS_FILE", WORKSPACE_ROOT / ".sercrets" / "secrets.toml"))
 
+_CACHE_LOCK = threading.Lock()
 
-@dataclass(slots=True)
+
+@dataclass(slots=True, frozen=True)
 class OpenAISecrets:
     """Secrets required to authenticate with the OpenAI API."""
 
@@ -29,7 +36,7 @@ class OpenAISecrets:
     deep_research_model: Optional[str] = None
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class OpenAICompatibleEmbeddingSecrets:
     """Configuration for OpenAI-compatible embedding services."""
 
@@ -38,7 +45,7 @@ class OpenAICompatibleEmbeddingSecrets:
     api_key: Optional[str] = None
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class GeminiSecrets:
     """Secrets required to call the Gemini Interactions API."""
 
@@ -47,7 +54,7 @@ class GeminiSecrets:
     api_endpoint: Optional[str] = None
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class MCPServerSecrets:
     """Transport configuration needed to reach an MCP service."""
 
@@ -80,7 +87,7 @@ class MCPServerSecrets:
         return payload
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class Neo4jSecrets:
     """Credentials required to connect to a Neo4j database."""
 
@@ -90,7 +97,7 @@ class Neo4jSecrets:
     database: Optional[str] = None
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class DifyKnowledgeBaseSecrets:
     """Secrets required to call the Dify knowledge base HTTP API."""
 
@@ -99,7 +106,7 @@ class DifyKnowledgeBaseSecrets:
     dataset_id: str
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class Secrets:
     """Container bundling all supported secret entries."""
 
@@ -126,10 +133,18 @@ def load_secrets(path: Optional[Path] = None) -> Secrets:
     Load the secrets file and return strongly typed entries.
 
     Sections whose table name ends with `_mcp` are interpreted as MCP transport
-    settings.
+    settings. Results are cached by resolved path and modification time; call
+    ``load_secrets.cache_clear()`` to force a re-read.
     """
 
-    secrets_path = path or discover_secrets_path()
+    secrets_path = (path or discover_secrets_path()).resolve()
+    mtime_ns = secrets_path.stat().st_mtime_ns
+    with _CACHE_LOCK:
+        return _read_secrets(secrets_path, mtime_ns)
+
+
+@lru_cache(maxsize=1)
+def _read_secrets(secrets_path: Path, mtime_ns: int) -> Secrets:
     with secrets_path.open("rb") as handle:
         data = tomllib.load(handle)
 
@@ -202,7 +217,7 @@ def load_secrets(path: Optional[Path] = None) -> Secrets:
 
     return Secrets(
         openai=openai_secrets,
-        mcp_servers=dict(mcp_entries),
+        mcp_servers=MappingProxyType(mcp_entries),
         gemini=gemini_secrets,
         openai_compatible_embedding=embedding_data,
         neo4j=neo4j_secrets,
@@ -210,6 +225,9 @@ def load_secrets(path: Optional[Path] = None) -> Secrets:
     )
 
 
+load_secrets.cache_clear = _read_secrets.cache_clear  # type: ignore[attr-defined]
+
+
 def _load_embedding_section(data: Mapping[str, Any]) -> Optional[OpenAICompatibleEmbeddingSecrets]:
     for key in ("openai_compatitble_embedding", "openai_compatible_embedding"):
         section = data.get(key)
@@ -14,12 +14,14 @@ from .neo4j import Neo4jClient
 from .openalex import OpenAlexClient
 from .registry import ToolDescriptor, list_registered_tools
 from .responses import ResponsePayload, WorkspaceResponse
+from .semantic_cache import LLMSemanticCache
 
 __all__ = [
     "CrossrefClient",
     "OpenAlexClient",
     "DifyKnowledgeBaseClient",
     "GeminiDeepResearchClient",
+    "LLMSemanticCache",
     "OpenAICompatibleEmbeddingClient",
     "PythonExecutor",
     "ResponsePayload",
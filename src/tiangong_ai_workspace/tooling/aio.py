@@ -0,0 +1,35 @@
+"""
+Helpers for bridging synchronous call sites and asyncio coroutines.
+
+Workspace entry points (CLI commands, LangChain tools, agent factories) are
+synchronous, while several integrations benefit from running I/O concurrently.
+These helpers let sync code drive coroutines without caring whether an event loop
+is already running in the current thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Coroutine, TypeVar
+
+__all__ = ["run_sync"]
+
+T = TypeVar("T")
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run `coro` to completion and return its result.
+
+    When the calling thread already runs an event loop (for example inside a
+    notebook or an async server), the coroutine executes on a fresh loop in a
+    worker thread instead of failing with ``asyncio.run``'s nested-loop error.
+    """
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
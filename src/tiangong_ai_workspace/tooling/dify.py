@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
-from typing import Any, Mapping, MutableMapping, Optional, Sequence
+from typing import Any, AsyncIterator, Mapping, MutableMapping, Optional, Sequence
 
 import httpx
+import orjson
 
 from ..secrets import DifyKnowledgeBaseSecrets, Secrets, load_secrets
 
@@ -141,12 +144,27 @@ class RetrievalModelConfig:
 
 @dataclass(slots=True)
 class DifyKnowledgeBaseClient:
-    """Lightweight wrapper around the Dify dataset retrieval API."""
+    """
+    Lightweight wrapper around the Dify dataset retrieval API.
+
+    When no `http_client` is supplied the client lazily opens a pooled HTTP/2
+    :class:`httpx.Client` and reuses it across retrievals, avoiding a fresh TCP/TLS
+    handshake per query. Call :meth:`close` (or use the client as a context
+    manager) to release the pooled connections.
+
+    The async helpers use `async_http_client` when supplied (left open for the
+    caller to close, like `http_client`); otherwise each call opens a
+    short-lived :class:`httpx.AsyncClient`.
+    """
 
     secrets: Optional[Secrets] = None
     timeout: float = 15.0
     http_client: Optional[httpx.Client] = None
+    async_http_client: Optional[httpx.AsyncClient] = None
     _config: DifyKnowledgeBaseSecrets = field(init=False, repr=False)
+    _url: str = field(init=False, repr=False)
+    _headers: Mapping[str, str] = field(init=False, repr=False)
+    _owns_http_client: bool = field(default=False, init=False, repr=False)
 
     def __post_init__(self) -> None:
         loaded = self.secrets or load_secrets()
@@ -155,6 +173,29 @@ class DifyKnowledgeBaseClient:
             raise DifyKnowledgeBaseError("Dify knowledge base secrets are not configured.")
         object.__setattr__(self, "secrets", loaded)
         object.__setattr__(self, "_config", config)
+        object.__setattr__(self, "_url", f"{config.api_base_url}/datasets/{config.dataset_id}/retrieve")
+        object.__setattr__(
+            self,
+            "_headers",
+            {
+                "Authorization": f"Bearer {config.api_key}",
+                "Content-Type": "application/json",
+            },
+        )
+
+    def __enter__(self) -> DifyKnowledgeBaseClient:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the pooled HTTP client if this instance created it."""
+
+        if self._owns_http_client and self.http_client is not None:
+            self.http_client.close()
+            object.__setattr__(self, "http_client", None)
+            object.__setattr__(self, "_owns_http_client", False)
 
     def retrieve(
         self,
@@ -167,12 +208,81 @@ class DifyKnowledgeBaseClient:
     ) -> Mapping[str, Any]:
         """Retrieve knowledge chunks for the given query."""
 
+        payload = self._build_payload(query, top_k=top_k, retrieval_model=retrieval_model, metadata_filters=metadata_filters, options=options)
+
+        LOGGER.debug("Calling Dify knowledge base: %s", self._url)
+        try:
+            response = self._post(self._url, headers=self._headers, json=payload)
+            response.raise_for_status()
+        except httpx.HTTPError as exc:
+            LOGGER.exception("Dify knowledge base request failed")
+            raise DifyKnowledgeBaseError(f"HTTP error querying Dify knowledge base: {exc}") from exc
+
+        return _parse_retrieval(query, response)
+
+    async def retrieve_async(
+        self,
+        query: str,
+        *,
+        top_k: Optional[int] = None,
+        retrieval_model: RetrievalModelConfig | Mapping[str, Any] | None = None,
+        metadata_filters: MetadataFilterGroup | Mapping[str, Any] | Sequence[MetadataFilterCondition | Mapping[str, Any]] | None = None,
+        options: Optional[Mapping[str, Any]] = None,
+    ) -> Mapping[str, Any]:
+        """Async variant of :meth:`retrieve` using `async_http_client` or a short-lived :class:`httpx.AsyncClient`."""
+
+        async with self._async_client() as client:
+            return await self._aretrieve(client, query, top_k=top_k, retrieval_model=retrieval_model, metadata_filters=metadata_filters, options=options)
+
+    async def batch_retrieve(
+        self,
+        queries: Sequence[str],
+        *,
+        top_k: Optional[int] = None,
+        retrieval_model: RetrievalModelConfig | Mapping[str, Any] | None = None,
+        metadata_filters: MetadataFilterGroup | Mapping[str, Any] | Sequence[MetadataFilterCondition | Mapping[str, Any]] | None = None,
+        options: Optional[Mapping[str, Any]] = None,
+    ) -> list[Mapping[str, Any]]:
+        """
+        Retrieve chunks for several queries concurrently over one async connection pool.
+
+        Results are returned in the same order as `queries`.
+        """
+
+        async with self._async_client() as client:
+            results = await asyncio.gather(
+                *(self._aretrieve(client, query, top_k=top_k, retrieval_model=retrieval_model, metadata_filters=metadata_filters, options=options) for query in queries)
+            )
+        return list(results)
+
+    async def _aretrieve(self, client: httpx.AsyncClient, query: str, **kwargs: Any) -> Mapping[str, Any]:
+        payload = self._build_payload(query, **kwargs)
+
+        LOGGER.debug("Calling Dify knowledge base (async): %s", self._url)
+        try:
+            response = await client.post(self._url, headers=self._headers, content=orjson.dumps(payload), timeout=self.timeout)
+            response.raise_for_status()
+        except httpx.HTTPError as exc:
+            LOGGER.exception("Dify knowledge base request failed")
+            raise DifyKnowledgeBaseError(f"HTTP error querying Dify knowledge base: {exc}") from exc
+
+        return _parse_retrieval(query, response)
+
+    def _build_payload(
+        self,
+        query: str,
+        *,
+        top_k: Optional[int],
+        retrieval_model: RetrievalModelConfig | Mapping[str, Any] | None,
+        metadata_filters: MetadataFilterGroup | Mapping[str, Any] | Sequence[MetadataFilterCondition | Mapping[str, Any]] | None,
+        options: Optional[Mapping[str, Any]],
+    ) -> Mapping[str, Any]:
         if not query.strip():
             raise DifyKnowledgeBaseError("Query cannot be empty.")
 
         payload: MutableMapping[str, Any] = {"query": query}
         if options:
-            payload.update(dict(options))
+            payload |= options
 
         normalized_filters = _normalize_metadata_filters(metadata_filters)
         existing_model = payload.get("retrieval_model")
@@ -186,35 +296,45 @@ class DifyKnowledgeBaseClient:
             raise DifyKnowledgeBaseError("retrieval_model provided via options must be a JSON object.")
         if model_payload is not None:
             payload["retrieval_model"] = model_payload
+        return payload
 
-        url = f"{self._config.api_base_url}/datasets/{self._config.dataset_id}/retrieve"
-        headers = {
-            "Authorization": f"Bearer {self._config.api_key}",
-            "Content-Type": "application/json",
-        }
-
-        LOGGER.debug("Calling Dify knowledge base: %s", url)
-        try:
-            response = self._post(url, headers=headers, json=payload)
-            response.raise_for_status()
-        except httpx.HTTPError as exc:
-            LOGGER.exception("Dify knowledge base request failed")
-            raise DifyKnowledgeBaseError(f"HTTP error querying Dify knowledge base: {exc}") from exc
-
-        try:
-            data = response.json()
-        except ValueError as exc:  # pragma: no cover - defensive fallback
-            raise DifyKnowledgeBaseError("Dify knowledge base returned invalid JSON.") from exc
-
-        return {
-            "query": query,
-            "result": data,
-        }
+    @asynccontextmanager
+    async def _async_client(self) -> AsyncIterator[httpx.AsyncClient]:
+        if self.async_http_client is not None:
+            yield self.async_http_client
+            return
+        async with httpx.AsyncClient(
+            http2=True,
+            timeout=self.timeout,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        ) as client:
+            yield client
 
     def _post(self, url: str, *, headers: Mapping[str, str], json: Mapping[str, Any]) -> httpx.Response:
-        if self.http_client is not None:
-            return self.http_client.post(url, headers=headers, json=json, timeout=self.timeout)
-        return httpx.post(url, headers=headers, json=json, timeout=self.timeout)
+        return self._client().post(url, headers=headers, content=orjson.dumps(json), timeout=self.timeout)
+
+    def _client(self) -> httpx.Client:
+        if self.http_client is None:
+            client = httpx.Client(
+                http2=True,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            )
+            object.__setattr__(self, "http_client", client)
+            object.__setattr__(self, "_owns_http_client", True)
+        return self.http_client
+
+
+def _parse_retrieval(query: str, response: httpx.Response) -> Mapping[str, Any]:
+    try:
+        data = orjson.loads(response.content)
+    except orjson.JSONDecodeError as exc:  # pragma: no cover - defensive fallback
+        raise DifyKnowledgeBaseError("Dify knowledge base returned invalid JSON.") from exc
+
+    return {
+        "query": query,
+        "result": data,
+    }
 
 
 def _normalize_metadata_filters(
@@ -7,6 +7,7 @@ from dataclasses import dataclass, field
 from typing import Any, Mapping, MutableMapping, Optional, Sequence
 
 import httpx
+import numpy as np
 
 from ..secrets import OpenAICompatibleEmbeddingSecrets, Secrets, load_secrets
 
@@ -93,6 +94,22 @@ class OpenAICompatibleEmbeddingClient:
             raw_response=data,
         )
 
+    def embed_batch(self, texts: Sequence[str], *, model_override: str | None = None) -> np.ndarray:
+        """
+        Embed many texts in a single request.
+
+        Returns a ``(len(texts), dimensions)`` float32 array whose rows align with
+        `texts`. Blank texts are rejected rather than dropped so rows never shift.
+        """
+
+        if any(not text.strip() for text in texts):
+            raise OpenAIEmbeddingError("embed_batch requires every input text to be non-empty.")
+        result = self.embed(texts, model_override=model_override)
+        matrix = np.asarray(result.embeddings, dtype=np.float32)
+        if matrix.shape[0] != len(texts):
+            raise OpenAIEmbeddingError(f"Embedding service returned {matrix.shape[0]} vectors for {len(texts)} inputs.")
+        return matrix
+
     def _post(self, url: str, *, headers: Mapping[str, str], json: Mapping[str, Any]) -> httpx.Response:
         if self.http_client is not None:
             return self.http_client.post(url, headers=headers, json=json, timeout=self.timeout)
@@ -135,6 +152,10 @@ def _parse_embeddings(payload: Mapping[str, Any]) -> tuple[list[list[float]], Op
     if not isinstance(data_entries, Sequence) or isinstance(data_entries, (str, bytes)):
         raise OpenAIEmbeddingError("Embedding service did not return a valid 'data' list.")
 
+    if all(isinstance(entry, Mapping) and isinstance(entry.get("index"), int) for entry in data_entries):
+        # The API reports each vector's input position; honour it for batched requests.
+        data_entries = sorted(data_entries, key=lambda entry: entry["index"])
+
     embeddings: list[list[float]] = []
     actual_dim: Optional[int] = None
     for entry in data_entries:
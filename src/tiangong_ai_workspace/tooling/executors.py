@@ -9,6 +9,7 @@ callers or persisted for auditing.
 from __future__ import annotations
 
 import contextlib
+import hashlib
 import io
 import logging
 import os
@@ -16,14 +17,21 @@ import shlex
 import signal
 import subprocess
 import textwrap
+import threading
 import time
 import traceback
+from collections import OrderedDict, deque
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Mapping, MutableMapping, Optional
+from types import CodeType
+from typing import IO, Any, Callable, Mapping, MutableMapping, NoReturn, Optional
+
+import msgspec
 
 LOGGER = logging.getLogger(__name__)
 
+OutputCallback = Callable[[str], None]
+
 __all__ = [
     "PythonExecutionResult",
     "PythonExecutor",
@@ -32,8 +40,16 @@ __all__ = [
 ]
 
 
-@dataclass(slots=True)
-class ShellExecutionResult:
+def _encode_extra(value: Any) -> Any:
+    if isinstance(value, Path):
+        return str(value)
+    raise NotImplementedError(f"Cannot serialise objects of type {type(value).__name__}")
+
+
+_JSON_ENCODER = msgspec.json.Encoder(enc_hook=_encode_extra)
+
+
+class ShellExecutionResult(msgspec.Struct, frozen=True):
     """Structured result for shell command execution."""
 
     command: str
@@ -45,54 +61,98 @@ class ShellExecutionResult:
     timestamp: float
 
     def to_dict(self) -> MutableMapping[str, Any]:
-        return {
-            "command": self.command,
-            "exit_code": self.exit_code,
-            "stdout": self.stdout,
-            "stderr": self.stderr,
-            "cwd": str(self.cwd),
-            "duration": self.duration,
-            "timestamp": self.timestamp,
-        }
+        return msgspec.to_builtins(self, enc_hook=_encode_extra)
+
+    def to_json(self) -> bytes:
+        return _JSON_ENCODER.encode(self)
 
 
 @dataclass(slots=True)
 class ShellExecutor:
     """
-    Small wrapper around `subprocess.run` with predictable output structure.
+    Small wrapper around `subprocess.Popen` with predictable output structure.
+
+    Output is streamed line by line: each stream is drained by a reader thread
+    into a bounded ring buffer holding the last `max_output_lines` lines, and
+    optionally tee-d to `on_stdout` / `on_stderr` callbacks so callers can
+    surface progress before the command finishes.
+
+    `runner` is the process factory and defaults to `subprocess.Popen`; tests can
+    inject any callable returning an object with `stdout`, `stderr`, `wait()`
+    and `kill()` to exercise the executor without spawning a shell.
     """
 
     workdir: Path = Path.cwd()
     default_timeout: int = 120
     allowed_binaries: tuple[str, ...] | None = None
     env: Mapping[str, str] | None = None
+    max_output_lines: int = 16384
+    runner: Callable[..., subprocess.Popen[str]] = subprocess.Popen
 
-    def run(self, command: str, *, timeout: Optional[int] = None) -> ShellExecutionResult:
+    def run(
+        self,
+        command: str,
+        *,
+        timeout: Optional[float] = None,
+        on_stdout: Optional[OutputCallback] = None,
+        on_stderr: Optional[OutputCallback] = None,
+    ) -> ShellExecutionResult:
         self._validate_command(command)
         effective_timeout = timeout or self.default_timeout
         started = time.perf_counter()
-        completed = subprocess.run(
+        process = self.runner(
             command,
             shell=True,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
             cwd=self.workdir,
-            timeout=effective_timeout,
             env=self._build_env(),
         )
+        stdout_lines: deque[str] = deque(maxlen=self.max_output_lines)
+        stderr_lines: deque[str] = deque(maxlen=self.max_output_lines)
+        reader_errors: list[BaseException] = []
+        readers = [
+            threading.Thread(target=_drain_stream, args=(process.stdout, stdout_lines, on_stdout, reader_errors), daemon=True),
+            threading.Thread(target=_drain_stream, args=(process.stderr, stderr_lines, on_stderr, reader_errors), daemon=True),
+        ]
+        for reader in readers:
+            reader.start()
+        # One deadline covers the process and its pipes: a background child that
+        # inherits stdout (``server &``) must not outlive the timeout.
+        deadline = started + effective_timeout
+        try:
+            exit_code = process.wait(timeout=effective_timeout)
+        except subprocess.TimeoutExpired:
+            self._abort(process, command, effective_timeout, stdout_lines, stderr_lines)
+        for reader in readers:
+            reader.join(timeout=max(deadline - time.perf_counter(), 0))
+        if any(reader.is_alive() for reader in readers):
+            self._abort(process, command, effective_timeout, stdout_lines, stderr_lines)
+        if reader_errors:
+            raise reader_errors[0]
         duration = time.perf_counter() - started
         timestamp = time.time()
-        LOGGER.debug("ShellExecutor ran '%s' (timeout=%s, exit=%s)", command, effective_timeout, completed.returncode)
+        LOGGER.debug("ShellExecutor ran '%s' (timeout=%s, exit=%s)", command, effective_timeout, exit_code)
         return ShellExecutionResult(
             command=command,
-            exit_code=completed.returncode,
-            stdout=completed.stdout,
-            stderr=completed.stderr,
+            exit_code=exit_code,
+            stdout="".join(stdout_lines),
+            stderr="".join(stderr_lines),
             cwd=self.workdir,
             duration=duration,
             timestamp=timestamp,
         )
 
+    @staticmethod
+    def _abort(process: subprocess.Popen[str], command: str, timeout: float, stdout_lines: deque[str], stderr_lines: deque[str]) -> NoReturn:
+        process.kill()
+        process.wait()
+        raise subprocess.TimeoutExpired(command, timeout, output="".join(stdout_lines), stderr="".join(stderr_lines)) from None
+
     def _validate_command(self, command: str) -> None:
         if not self.allowed_binaries:
             return
@@ -112,27 +172,53 @@ class ShellExecutor:
         return merged
 
 
-@dataclass(slots=True)
-class PythonExecutionResult:
-    """Structured result for arbitrary Python code execution."""
+def _drain_stream(stream: Optional[IO[str]], lines: deque[str], callback: Optional[OutputCallback], errors: list[BaseException]) -> None:
+    # Failures are handed back to `run()` instead of dying with the thread. A failing
+    # callback is dropped but the pipe keeps draining so the child never blocks on it.
+    if stream is None:  # pragma: no cover - pipes are always requested
+        return
+    try:
+        with stream:
+            for line in stream:
+                lines.append(line)
+                if callback is None:
+                    continue
+                try:
+                    callback(line)
+                except Exception as exc:
+                    errors.append(exc)
+                    callback = None
+    except Exception as exc:
+        errors.append(exc)
+
+
+def _byte_capture() -> tuple[io.BytesIO, io.TextIOWrapper]:
+    """Return a byte buffer and a text wrapper that batches encodes until flushed."""
+
+    raw = io.BytesIO()
+    return raw, io.TextIOWrapper(raw, encoding="utf-8", errors="replace", newline="\n", write_through=False, line_buffering=False)
+
+
+class PythonExecutionResult(msgspec.Struct, frozen=True):
+    """
+    Structured result for arbitrary Python code execution.
+
+    Executor globals are not captured per run; call
+    :meth:`PythonExecutor.globals_snapshot` when a copy is actually needed.
+    """
 
     code: str
     stdout: str
     stderr: str
-    globals_used: Mapping[str, Any]
     duration: float
     timestamp: float
     timed_out: bool
 
     def to_dict(self) -> MutableMapping[str, Any]:
-        return {
-            "code": self.code,
-            "stdout": self.stdout,
-            "stderr": self.stderr,
-            "duration": self.duration,
-            "timestamp": self.timestamp,
-            "timed_out": self.timed_out,
-        }
+        return msgspec.to_builtins(self)
+
+    def to_json(self) -> bytes:
+        return _JSON_ENCODER.encode(self)
 
 
 class PythonExecutor:
@@ -141,24 +227,28 @@ class PythonExecutor:
 
     The executor captures stdout / stderr and surfaces them alongside any
     exceptions. Agents can reuse a single executor instance to preserve global
-    state between invocations if desired.
+    state between invocations if desired. Compiled snippets are kept in a small
+    LRU cache so repeated scaffolding code is not recompiled on every call.
     """
 
     def __init__(
         self,
         *,
-        shared_globals: Optional[MutableMapping[str, Any]] = None,
+        shared_globals: Optional[dict[str, Any]] = None,
         max_execution_seconds: Optional[int] = 90,
+        code_cache_size: int = 128,
     ) -> None:
-        self._globals: MutableMapping[str, Any] = shared_globals or {"__name__": "__agent_exec__"}
+        self._globals: dict[str, Any] = shared_globals or {"__name__": "__agent_exec__"}
         self._max_execution_seconds = max_execution_seconds
+        self._code_cache_size = code_cache_size
+        self._code_cache: OrderedDict[bytes, tuple[str, CodeType]] = OrderedDict()
 
     def run(self, code: str, *, locals_override: Optional[MutableMapping[str, Any]] = None) -> PythonExecutionResult:
-        stdout_buffer = io.StringIO()
-        stderr_buffer = io.StringIO()
+        stdout_bytes, stdout_buffer = _byte_capture()
+        stderr_bytes, stderr_buffer = _byte_capture()
         local_vars: MutableMapping[str, Any] = locals_override or {}
 
-        compiled_code = compile(code, "<agent-python>", "exec")
+        dedented_code, compiled_code = self._compile(code)
 
         timed_out = False
         started = time.perf_counter()
@@ -173,19 +263,42 @@ class PythonExecutor:
             except Exception:  # pragma: no cover - error text captured for caller
                 traceback.print_exc(file=stderr_buffer)
 
-        stdout_value = stdout_buffer.getvalue()
-        stderr_value = stderr_buffer.getvalue()
+        stdout_buffer.flush()
+        stderr_buffer.flush()
+        stdout_value = stdout_bytes.getvalue().decode("utf-8", errors="replace")
+        stderr_value = stderr_bytes.getvalue().decode("utf-8", errors="replace")
         duration = time.perf_counter() - started
         return PythonExecutionResult(
-            code=textwrap.dedent(code),
+            code=dedented_code,
             stdout=stdout_value,
             stderr=stderr_value,
-            globals_used=dict(self._globals),
             duration=duration,
             timestamp=timestamp,
             timed_out=timed_out,
         )
 
+    def globals_snapshot(self) -> Mapping[str, Any]:
+        """Return a shallow copy of the executor's global namespace."""
+
+        return dict(self._globals)
+
+    def _compile(self, code: str) -> tuple[str, CodeType]:
+        # blake2b is only used as a fast fingerprint here, not for security.
+        key = hashlib.blake2b(code.encode("utf-8"), digest_size=16).digest()
+        cached = self._code_cache.get(key)
+        if cached is not None:
+            self._code_cache.move_to_end(key)
+            return cached
+
+        # Only snippets whose first line is indented (or blank) can have a common prefix to strip.
+        source = textwrap.dedent(code) if code[:1].isspace() else code
+        entry = (source, compile(source, "<agent-python>", "exec"))
+        if self._code_cache_size > 0:
+            self._code_cache[key] = entry
+            if len(self._code_cache) > self._code_cache_size:
+                self._code_cache.popitem(last=False)
+        return entry
+
     def _execute_with_timeout(self, compiled_code: Any, local_vars: MutableMapping[str, Any]) -> None:
         if not self._max_execution_seconds or self._max_execution_seconds <= 0 or not hasattr(signal, "SIGALRM"):
             exec(compiled_code, self._globals, local_vars)
@@ -8,15 +8,21 @@ key lookups across the codebase and makes it easier to swap providers later.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, Literal, Optional, Protocol
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Literal, Mapping, Optional, Protocol
 
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
 from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatResult
 from langchain_openai import ChatOpenAI
+from pydantic import Field, SkipValidation
 
-from ..secrets import OpenAISecrets, Secrets, load_secrets
+from ..secrets import Secrets, load_secrets
+from .semantic_cache import LLMSemanticCache
 
-__all__ = ["ModelPurpose", "ModelRouter"]
+__all__ = ["CachingChatOpenAI", "ModelPurpose", "ModelRouter"]
 
 ModelPurpose = Literal["general", "deep_research", "creative"]
 
@@ -36,16 +42,106 @@ class LLMProvider(Protocol):
     ) -> BaseChatModel: ...
 
 
+class CachingChatOpenAI(ChatOpenAI):
+    """
+    `ChatOpenAI` variant that consults an :class:`LLMSemanticCache` before calling the API.
+
+    Deterministic calls (``temperature == 0``) only reuse exact matches. Other
+    calls may also reuse the response to a semantically similar final message,
+    but only when every earlier message matches exactly, so an agent loop that
+    appends one observation per step never replays its previous answer. Both the
+    sync and async (``ainvoke``) paths are cached.
+    """
+
+    response_cache: SkipValidation[Optional[LLMSemanticCache]] = Field(default=None, exclude=True)
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: CallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.response_cache is None:
+            return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+        payload, text, scope = self._cache_keys(messages, stop, kwargs)
+        result = self.response_cache.get_or_compute(
+            payload,
+            lambda: super(CachingChatOpenAI, self)._generate(messages, stop=stop, run_manager=run_manager, **kwargs),
+            text=text,
+            scope=scope,
+        )
+        return _fresh_result(result)
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.response_cache is None:
+            return await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+        payload, text, scope = self._cache_keys(messages, stop, kwargs)
+        result = await self.response_cache.aget_or_compute(
+            payload,
+            lambda: super(CachingChatOpenAI, self)._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs),
+            text=text,
+            scope=scope,
+        )
+        return _fresh_result(result)
+
+    def _cache_keys(self, messages: list[BaseMessage], stop: list[str] | None, kwargs: Mapping[str, Any]) -> tuple[Mapping[str, Any], Optional[str], Mapping[str, Any]]:
+        scope = {
+            "model": self.model_name,
+            "temperature": self.temperature,
+            "stop": stop,
+            "kwargs": kwargs,
+            "history": [_message_key(message) for message in messages[:-1]],
+        }
+        payload = {**scope, "messages": [_message_key(message) for message in messages[-1:]]}
+        text = str(messages[-1].content) if self.temperature and messages else None
+        return payload, text, scope
+
+
+def _fresh_result(result: ChatResult) -> ChatResult:
+    # Hand out a fresh copy without ids: LangChain stamps run ids onto returned
+    # messages, and `add_messages` would treat a repeated id as an update.
+    fresh = result.model_copy(deep=True)
+    for generation in fresh.generations:
+        generation.message.id = None
+    return fresh
+
+
+def _message_key(message: BaseMessage) -> Mapping[str, Any]:
+    """Cache-key view of a message; ids and run metadata differ between identical turns."""
+
+    return {"role": message.type, "content": message.content, "tool_calls": getattr(message, "tool_calls", None) or None}
+
+
 @dataclass(slots=True)
 class OpenAIProvider:
     """LLM provider backed by the OpenAI Chat Completions API."""
 
     secrets: Secrets
     name: str = "openai"
+    cache: Optional[LLMSemanticCache] = None
+    _api_key: str = field(init=False, repr=False)
+    _model_for: Dict[str, str] = field(init=False, repr=False)
 
     def __post_init__(self) -> None:
-        if not self.secrets.openai:
+        creds = self.secrets.openai
+        if not creds:
             raise RuntimeError("OpenAI credentials are not configured. Populate `.sercrets/secrets.toml` based on the example file.")
+        fallback = creds.chat_model or creds.model or creds.deep_research_model or "o4-mini-deep-research"
+        self._api_key = creds.api_key
+        self._model_for = {
+            "deep_research": creds.deep_research_model or fallback,
+            "creative": fallback,
+            "general": fallback,
+        }
 
     def create_chat_model(
         self,
@@ -56,27 +152,25 @@ class OpenAIProvider:
         model_override: str | None,
     ) -> BaseChatModel:
         model_name = model_override or self._select_model(purpose)
-        creds: OpenAISecrets = self.secrets.openai  # type: ignore[assignment]
-        return ChatOpenAI(
-            api_key=creds.api_key,
-            model=model_name,
-            temperature=temperature,
-            timeout=timeout,
-        )
+        if self.cache is not None:
+            return CachingChatOpenAI(
+                api_key=self._api_key,
+                model=model_name,
+                temperature=temperature,
+                timeout=timeout,
+                response_cache=self.cache,
+            )
+        return _shared_chat_model(self._api_key, model_name, temperature, timeout)
 
     def _select_model(self, purpose: ModelPurpose) -> str:
-        creds: OpenAISecrets = self.secrets.openai  # type: ignore[assignment]
-        if purpose == "deep_research" and creds.deep_research_model:
-            return creds.deep_research_model
-        if purpose == "creative" and creds.chat_model:
-            return creds.chat_model
-        if creds.chat_model:
-            return creds.chat_model
-        if creds.model:
-            return creds.model
-        if creds.deep_research_model:
-            return creds.deep_research_model
-        return "o4-mini-deep-research"
+        return self._model_for[purpose]
+
+
+@lru_cache(maxsize=16)
+def _shared_chat_model(api_key: str, model: str, temperature: float, timeout: int | None) -> ChatOpenAI:
+    """Reuse `ChatOpenAI` instances (and their HTTP clients) across identical requests."""
+
+    return ChatOpenAI(api_key=api_key, model=model, temperature=temperature, timeout=timeout)
 
 
 class ModelRouter:
@@ -87,11 +181,12 @@ class ModelRouter:
         *,
         secrets: Optional[Secrets] = None,
         default_provider: str = "openai",
+        cache: Optional[LLMSemanticCache] = None,
     ) -> None:
         self._secrets = secrets or load_secrets()
         self._providers: Dict[str, LLMProvider] = {}
         self._default_provider = default_provider
-        self.register_provider(OpenAIProvider(self._secrets))
+        self.register_provider(OpenAIProvider(self._secrets, cache=cache))
         if default_provider not in self._providers:
             raise ValueError(f"Unknown default LLM provider '{default_provider}'.")
 
@@ -9,6 +9,8 @@ reading source code. CLI commands use this module for structured listings.
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Any, Iterable, Mapping, MutableMapping, Tuple
 
 from .config import RegistryEntryConfig, load_workspace_config
@@ -36,6 +38,7 @@ _BOOTSTRAPPED = False
 def register_tool(descriptor: ToolDescriptor) -> None:
     """Register a tool descriptor, replacing any existing entry with the same name."""
     _TOOL_REGISTRY[descriptor.name] = descriptor
+    list_registered_tools.cache_clear()
 
 
 def register_many(descriptors: Iterable[ToolDescriptor]) -> None:
@@ -44,10 +47,11 @@ def register_many(descriptors: Iterable[ToolDescriptor]) -> None:
         register_tool(descriptor)
 
 
+@lru_cache(maxsize=1)
 def list_registered_tools() -> Mapping[str, ToolDescriptor]:
-    """Return an immutable view of the current tool registry."""
+    """Return an immutable snapshot of the current tool registry, cached until the next registration."""
     _bootstrap_registry()
-    return dict(_TOOL_REGISTRY)
+    return MappingProxyType(dict(_TOOL_REGISTRY))
 
 
 def _bootstrap_registry() -> None:
@@ -0,0 +1,323 @@
+"""
+Response cache that short-circuits repeated or paraphrased service calls.
+
+Entries are matched first by an exact SHA-256 digest of the request payload and,
+when an embedding client is configured, by cosine similarity between prompt
+embeddings. Agents use it to avoid repeating Tavily searches, document workflows,
+and chat completions that were already answered earlier in the session.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Mapping, MutableMapping, Optional, Sequence, TypeVar
+
+import numpy as np
+
+from .embeddings import OpenAICompatibleEmbeddingClient, OpenAIEmbeddingError
+
+LOGGER = logging.getLogger(__name__)
+
+__all__ = ["LLMSemanticCache", "LSHIndex", "cache_key"]
+
+T = TypeVar("T")
+
+_DEFAULT_SCOPE = "__default__"
+
+
+def cache_key(payload: Mapping[str, Any]) -> str:
+    """Return the SHA-256 digest of a JSON-serialised payload."""
+
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+@dataclass(slots=True)
+class LSHIndex:
+    """
+    Random-projection LSH index over unit-normalised embeddings.
+
+    Each hash table projects vectors onto `num_bits` Gaussian hyperplanes and
+    buckets them by the resulting sign pattern. Queries only score rows that share
+    a bucket (or a bucket one bit-flip away) in any table, so lookups stay cheap
+    as the cache grows instead of scanning every stored embedding.
+    """
+
+    num_bits: int = 12
+    num_hash_tables: int = 4
+    seed: int = 0
+    _projections: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _tables: list[dict[int, list[int]]] = field(default_factory=list, init=False, repr=False)
+    _matrix: Optional[np.ndarray] = field(default=None, init=False, repr=False)
+    _size: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.num_bits <= 0 or self.num_hash_tables <= 0:
+            raise ValueError("LSHIndex requires positive num_bits and num_hash_tables.")
+        self._tables = [{} for _ in range(self.num_hash_tables)]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, vector: np.ndarray) -> int:
+        """Insert a unit-normalised vector and return its row index."""
+
+        self._ensure_capacity(vector.shape[0])
+        row = self._size
+        self._matrix[row] = vector  # type: ignore[index]
+        self._size += 1
+        for table, signature in zip(self._tables, self._signatures(vector)):
+            table.setdefault(signature, []).append(row)
+        return row
+
+    def query(self, vector: np.ndarray) -> tuple[int, float] | None:
+        """Return the most similar stored row and its cosine similarity, if any candidate exists."""
+
+        if self._size == 0:
+            return None
+        candidates: set[int] = set()
+        flips = [1 << bit for bit in range(self.num_bits)]
+        for table, signature in zip(self._tables, self._signatures(vector)):
+            candidates.update(table.get(signature, ()))
+            for flip in flips:
+                candidates.update(table.get(signature ^ flip, ()))
+        if not candidates:
+            return None
+        rows = np.fromiter(candidates, dtype=np.intp, count=len(candidates))
+        scores = self._matrix[rows] @ vector  # type: ignore[index]
+        best = int(np.argmax(scores))
+        return int(rows[best]), float(scores[best])
+
+    def vectors(self) -> np.ndarray:
+        """Return the stored rows in insertion order (a view; copy before mutating)."""
+
+        if self._matrix is None:
+            return np.empty((0, 0), dtype=np.float32)
+        return self._matrix[: self._size]
+
+    def _signatures(self, vector: np.ndarray) -> list[int]:
+        assert self._projections is not None
+        bits = (self._projections @ vector).reshape(self.num_hash_tables, self.num_bits) > 0
+        weights = 1 << np.arange(self.num_bits, dtype=np.int64)
+        return [int(value) for value in bits @ weights]
+
+    def _ensure_capacity(self, dim: int) -> None:
+        if self._matrix is None:
+            rng = np.random.default_rng(self.seed)
+            self._projections = rng.standard_normal((self.num_hash_tables * self.num_bits, dim)).astype(np.float32)
+            self._matrix = np.empty((64, dim), dtype=np.float32)
+            return
+        if self._matrix.shape[1] != dim:
+            raise ValueError(f"Embedding dimension mismatch: index holds {self._matrix.shape[1]}, received {dim}.")
+        if self._size == self._matrix.shape[0]:
+            grown = np.empty((self._matrix.shape[0] * 2, dim), dtype=np.float32)
+            grown[: self._size] = self._matrix
+            self._matrix = grown
+
+
+@dataclass(slots=True)
+class _SemanticStore:
+    """LSH index plus the responses stored for each row."""
+
+    index: LSHIndex
+    responses: list[Any] = field(default_factory=list)
+
+    def best_match(self, query: np.ndarray) -> tuple[float, Any] | None:
+        match = self.index.query(query)
+        if match is None:
+            return None
+        row, score = match
+        return score, self.responses[row]
+
+    def append(self, vector: np.ndarray, response: Any) -> None:
+        self.index.add(vector)
+        self.responses.append(response)
+
+    def latest(self, count: int) -> "_SemanticStore":
+        """Return a rebuilt store holding only the `count` most recent rows."""
+
+        index = LSHIndex(num_bits=self.index.num_bits, num_hash_tables=self.index.num_hash_tables, seed=self.index.seed)
+        trimmed = _SemanticStore(index)
+        vectors = self.index.vectors()
+        for row in range(max(len(self.responses) - count, 0), len(self.responses)):
+            trimmed.append(vectors[row], self.responses[row])
+        return trimmed
+
+
+@dataclass(slots=True)
+class LLMSemanticCache:
+    """
+    Two-tier cache for expensive LLM/API responses.
+
+    Parameters
+    ----------
+    embedding_client:
+        Optional :class:`OpenAICompatibleEmbeddingClient`. When omitted the cache
+        only performs exact payload matches.
+    similarity_threshold:
+        Minimum cosine similarity required to reuse a semantically similar entry.
+    num_hash_tables:
+        Number of independent LSH tables per scope; more tables raise recall at
+        the cost of extra candidates to score.
+    max_entries:
+        Upper bound on exact-match entries, evicted least recently used first,
+        and on rows per similarity scope. A scope that outgrows it is rebuilt
+        from its newest half. ``None`` disables the bound.
+    """
+
+    embedding_client: Optional[OpenAICompatibleEmbeddingClient] = None
+    similarity_threshold: float = 0.92
+    num_hash_tables: int = 4
+    max_entries: Optional[int] = 1024
+    _exact: OrderedDict[str, Any] = field(default_factory=OrderedDict, init=False, repr=False)
+    _stores: MutableMapping[str, _SemanticStore] = field(default_factory=dict, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+
+        with self._lock:
+            self._exact.clear()
+            self._stores.clear()
+
+    def get_or_compute(
+        self,
+        payload: Mapping[str, Any],
+        compute: Callable[[], T],
+        *,
+        text: str | None = None,
+        scope: Mapping[str, Any] | None = None,
+    ) -> T:
+        """
+        Return a cached response for `payload` or compute and store a new one.
+
+        Parameters
+        ----------
+        payload:
+            JSON-compatible request description used for the exact-match key.
+        compute:
+            Zero-argument callable performing the real request on a cache miss.
+        text:
+            Natural language portion of the request. When provided (and an
+            embedding client is configured) it enables similarity matching.
+        scope:
+            Request parameters that must match exactly for a semantic hit, such as
+            the service name or model settings. Defaults to a shared scope.
+        """
+
+        key, scope_key = self._keys(payload, scope)
+        hit, cached = self._lookup_exact(key)
+        if hit:
+            return cached
+        vector = self._embed(text) if text else None
+        hit, cached = self._lookup_similar(scope_key, vector)
+        if hit:
+            return cached
+        response = compute()
+        self._store(key, scope_key, vector, response)
+        return response
+
+    async def aget_or_compute(
+        self,
+        payload: Mapping[str, Any],
+        compute: Callable[[], Awaitable[T]],
+        *,
+        text: str | None = None,
+        scope: Mapping[str, Any] | None = None,
+    ) -> T:
+        """Async counterpart of :meth:`get_or_compute`; embeddings are computed off the event loop."""
+
+        key, scope_key = self._keys(payload, scope)
+        hit, cached = self._lookup_exact(key)
+        if hit:
+            return cached
+        vector = await asyncio.to_thread(self._embed, text) if text else None
+        hit, cached = self._lookup_similar(scope_key, vector)
+        if hit:
+            return cached
+        response = await compute()
+        self._store(key, scope_key, vector, response)
+        return response
+
+    def warm(self, entries: Sequence[tuple[Mapping[str, Any], Any, str]], *, scope: Mapping[str, Any] | None = None) -> int:
+        """
+        Pre-populate the cache with known ``(payload, response, text)`` triples.
+
+        All texts are embedded with a single batched request, so warming N entries
+        costs one round trip. Returns the number of entries stored.
+        """
+
+        if not entries:
+            return 0
+        vectors = self._embed_many([text for _, _, text in entries])
+        for row, (payload, response, _) in enumerate(entries):
+            key, scope_key = self._keys(payload, scope)
+            self._store(key, scope_key, vectors[row] if vectors is not None else None, response)
+        return len(entries)
+
+    @staticmethod
+    def _keys(payload: Mapping[str, Any], scope: Mapping[str, Any] | None) -> tuple[str, str]:
+        return cache_key(payload), (cache_key(scope) if scope is not None else _DEFAULT_SCOPE)
+
+    def _lookup_exact(self, key: str) -> tuple[bool, Any]:
+        with self._lock:
+            if key in self._exact:
+                LOGGER.debug("Semantic cache exact hit for key %s", key[:12])
+                self._exact.move_to_end(key)
+                return True, self._exact[key]
+        return False, None
+
+    def _lookup_similar(self, scope_key: str, vector: Optional[np.ndarray]) -> tuple[bool, Any]:
+        if vector is None:
+            return False, None
+        with self._lock:
+            store = self._stores.get(scope_key)
+            match = store.best_match(vector) if store is not None else None
+        if match is not None and match[0] >= self.similarity_threshold:
+            LOGGER.debug("Semantic cache similarity hit (score=%.3f)", match[0])
+            return True, match[1]
+        return False, None
+
+    def _store(self, key: str, scope_key: str, vector: Optional[np.ndarray], response: Any) -> None:
+        limit = self.max_entries
+        with self._lock:
+            self._exact[key] = response
+            self._exact.move_to_end(key)
+            while limit is not None and len(self._exact) > limit:
+                self._exact.popitem(last=False)
+            if vector is not None:
+                store = self._stores.get(scope_key)
+                if store is None:
+                    store = self._stores[scope_key] = _SemanticStore(LSHIndex(num_hash_tables=self.num_hash_tables))
+                store.append(vector, response)
+                if limit is not None and len(store.responses) > limit:
+                    # LSH buckets cannot drop rows cheaply; rebuilding from the newest half keeps eviction amortised O(1).
+                    self._stores[scope_key] = store.latest(max(limit // 2, 1))
+
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        if not text.strip():
+            return None
+        vectors = self._embed_many([text])
+        if vectors is None or not vectors[0].any():
+            return None
+        return vectors[0]
+
+    def _embed_many(self, texts: Sequence[str]) -> Optional[np.ndarray]:
+        if self.embedding_client is None:
+            return None
+        try:
+            matrix = self.embedding_client.embed_batch(texts)
+        except OpenAIEmbeddingError:
+            LOGGER.warning("Embedding request failed; falling back to exact-match caching.", exc_info=True)
+            return None
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
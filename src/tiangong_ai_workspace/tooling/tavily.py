@@ -1,31 +1,88 @@
 """
 Wrapper around the Tavily MCP service for resilient web research.
 
-The implementation relies on the existing :class:`MCPToolClient` to communicate
-with remote MCP servers while adding retry logic and structured responses so
-agents can consume results predictably.
+The implementation relies on :func:`ainvoke_tool` to communicate with remote MCP
+servers while adding jittered async retries, a per-service circuit breaker, and
+structured responses so agents can consume results predictably.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import threading
+import time
 from dataclasses import dataclass, field
-from typing import Any, Mapping, MutableMapping, Optional
+from typing import Any, Awaitable, Callable, ClassVar, Mapping, MutableMapping, Optional, Sequence, TypeVar
 
-from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+from tenacity import AsyncRetrying, retry_if_exception_type, retry_if_not_exception_type, stop_after_attempt, wait_exponential_jitter
 
-from ..mcp_client import MCPToolClient
+from ..mcp_client import ainvoke_tool
 from ..secrets import MCPServerSecrets, Secrets, load_secrets
+from .aio import run_sync
+from .semantic_cache import LLMSemanticCache
 
 LOGGER = logging.getLogger(__name__)
 
 __all__ = ["TavilySearchClient", "TavilySearchError"]
 
 
+T = TypeVar("T")
+
+
 class TavilySearchError(RuntimeError):
     """Raised when the Tavily search integration fails."""
 
 
+class _CircuitOpenError(TavilySearchError):
+    """Raised without contacting the service while its circuit breaker is open."""
+
+
+@dataclass(slots=True)
+class _CircuitBreaker:
+    """
+    Minimal async-friendly circuit breaker.
+
+    After `fail_max` consecutive failures the breaker opens and rejects calls for
+    `reset_timeout` seconds. It then half-opens: exactly one trial call is let
+    through while concurrent callers keep being rejected, and the trial's outcome
+    either closes the breaker or re-opens it for another window.
+    """
+
+    fail_max: int = 5
+    reset_timeout: float = 60.0
+    _failures: int = field(default=0, init=False, repr=False)
+    _opened_at: Optional[float] = field(default=None, init=False, repr=False)
+    _trial_in_flight: bool = field(default=False, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    async def call_async(self, func: Callable[..., Awaitable[T]], *args: Any) -> T:
+        with self._lock:
+            is_trial = self._opened_at is not None
+            if is_trial:
+                if self._trial_in_flight or time.monotonic() - self._opened_at < self.reset_timeout:
+                    raise _CircuitOpenError(f"Circuit open after {self._failures} consecutive failures; retry in {self.reset_timeout:.0f}s.")
+                self._trial_in_flight = True
+        try:
+            result = await func(*args)
+        except Exception:
+            with self._lock:
+                self._failures += 1
+                if is_trial or self._failures >= self.fail_max:
+                    self._opened_at = time.monotonic()
+            raise
+        else:
+            with self._lock:
+                self._failures = 0
+                self._opened_at = None
+            return result
+        finally:
+            if is_trial:
+                # Also runs on cancellation, so an abandoned trial never wedges the breaker open.
+                with self._lock:
+                    self._trial_in_flight = False
+
+
 @dataclass(slots=True)
 class TavilySearchClient:
     """
@@ -42,12 +99,17 @@ class TavilySearchClient:
     tool_name:
         The tool name exposed by the Tavily MCP provider. ``"search"`` is used
         by default and can be overridden if the remote is configured differently.
+    cache:
+        Optional :class:`LLMSemanticCache` consulted before contacting the MCP
+        service so repeated or paraphrased queries reuse earlier results.
     """
 
     secrets: Optional[Secrets] = None
     service_name: str = "tavily"
     tool_name: str = "search"
+    cache: Optional[LLMSemanticCache] = None
     _service_registry: MutableMapping[str, MCPServerSecrets] = field(init=False, repr=False)
+    _breakers: ClassVar[dict[str, _CircuitBreaker]] = {}
 
     def __post_init__(self) -> None:
         loaded = self.secrets or load_secrets()
@@ -55,6 +117,17 @@ class TavilySearchClient:
         config = self._resolve_config(loaded)
         object.__setattr__(self, "_service_registry", {self.service_name: config})
 
+    @staticmethod
+    def is_configured(secrets: Optional[Secrets] = None, service_name: str = "tavily") -> bool:
+        """Return whether `service_name` has an MCP entry, without constructing a client."""
+
+        if secrets is None:
+            try:
+                secrets = load_secrets()
+            except FileNotFoundError:
+                return False
+        return service_name in secrets.mcp_servers
+
     def _resolve_config(self, secrets: Secrets) -> MCPServerSecrets:
         configs = secrets.mcp_servers
         if self.service_name not in configs:
@@ -62,12 +135,6 @@ class TavilySearchClient:
             raise TavilySearchError(f"MCP service '{self.service_name}' is not configured. Available services: {available}.")
         return configs[self.service_name]
 
-    @retry(
-        reraise=True,
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, max=12),
-        retry=retry_if_exception_type(TavilySearchError),
-    )
     def search(self, query: str, *, options: Optional[Mapping[str, Any]] = None) -> Mapping[str, Any]:
         """
         Execute a Tavily search request.
@@ -80,23 +147,73 @@ class TavilySearchClient:
             Optional dictionary forwarding additional parameters to the MCP tool.
         """
 
+        return run_sync(self.search_async(query, options=options))
+
+    async def search_async(self, query: str, *, options: Optional[Mapping[str, Any]] = None) -> Mapping[str, Any]:
+        """Async variant of :meth:`search` that talks to the MCP service without a blocking portal."""
+
+        payload = self._build_payload(query, options)
+        if self.cache is None:
+            return await self._search_async(query, payload)
+        scope = self._cache_scope(options)
+        return await self.cache.aget_or_compute({**scope, "query": query}, lambda: self._search_async(query, payload), text=query, scope=scope)
+
+    async def batch_search(self, queries: Sequence[str], *, options: Optional[Mapping[str, Any]] = None, return_exceptions: bool = False) -> list[Mapping[str, Any] | BaseException]:
+        """
+        Run several searches concurrently on one event loop and return results in query order.
+
+        With ``return_exceptions=True`` a failing query yields its exception in place
+        of a result instead of failing the whole batch, as with `asyncio.gather`.
+        """
+
+        return list(await asyncio.gather(*(self.search_async(query, options=options) for query in queries), return_exceptions=return_exceptions))
+
+    def _build_payload(self, query: str, options: Optional[Mapping[str, Any]]) -> MutableMapping[str, Any]:
         payload: MutableMapping[str, Any] = {"query": query}
         if options:
-            payload.update(dict(options))
+            payload |= options
+        return payload
+
+    def _cache_scope(self, options: Optional[Mapping[str, Any]]) -> Mapping[str, Any]:
+        return {"service": self.service_name, "tool": self.tool_name, "options": dict(options or {})}
+
+    def _breaker(self) -> _CircuitBreaker:
+        breakers = TavilySearchClient._breakers
+        breaker = breakers.get(self.service_name)
+        if breaker is None:
+            breaker = breakers.setdefault(self.service_name, _CircuitBreaker())
+        return breaker
+
+    async def _search_async(self, query: str, payload: Mapping[str, Any]) -> Mapping[str, Any]:
+        breaker = self._breaker()
+        retrying = AsyncRetrying(
+            reraise=True,
+            stop=stop_after_attempt(3),
+            wait=wait_exponential_jitter(initial=1, max=12),
+            retry=retry_if_exception_type(TavilySearchError) & retry_if_not_exception_type(_CircuitOpenError),
+        )
+        async for attempt in retrying:
+            with attempt:
+                response = await breaker.call_async(self._invoke, query, payload)
+        return response
 
+    async def _invoke(self, query: str, payload: Mapping[str, Any]) -> Mapping[str, Any]:
         LOGGER.debug("Invoking Tavily MCP search with payload: %s", payload)
         try:
-            with MCPToolClient(self._service_registry) as client:
-                result, attachments = client.invoke_tool(self.service_name, self.tool_name, payload)
+            result, attachments = await ainvoke_tool(self._service_registry[self.service_name], self.tool_name, payload)
         except Exception as exc:  # pragma: no cover - the wrapper converts to a typed error
             LOGGER.exception("Tavily MCP tool invocation failed")
             raise TavilySearchError(str(exc)) from exc
 
         LOGGER.debug("Tavily MCP search succeeded")
-        response: MutableMapping[str, Any] = {
-            "query": query,
-            "result": result,
-        }
-        if attachments:
-            response["attachments"] = attachments
-        return response
+        return _build_response(query, result, attachments)
+
+
+def _build_response(query: str, result: Any, attachments: Optional[list[dict[str, Any]]]) -> Mapping[str, Any]:
+    response: MutableMapping[str, Any] = {
+        "query": query,
+        "result": result,
+    }
+    if attachments:
+        response["attachments"] = attachments
+    return response
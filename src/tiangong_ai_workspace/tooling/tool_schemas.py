@@ -90,7 +90,7 @@ class EmbeddingGenerationOutput(BaseModel):
 
 
 class TavilySearchInput(BaseModel):
-    query: str = Field(..., description="Natural language search query.")
+    query: str | list[str] = Field(..., description="Natural language search query, or a list of independent queries to run concurrently.")
     options: dict[str, Any] | None = Field(default=None, description="Optional Tavily MCP parameters.")
 
 
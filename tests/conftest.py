@@ -0,0 +1,208 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterator, Mapping
+
+import httpx
+import pytest
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from tenacity import wait_none
+
+# These top-level imports load deep_agent (and with it workflows and LangChain) and
+# tooling once per process, controller and xdist workers alike, before collection.
+from tiangong_ai_workspace.agents import deep_agent
+from tiangong_ai_workspace.tooling import list_registered_tools
+from tiangong_ai_workspace.tooling import tavily as tavily_module
+
+HTTP_CACHE_PATH = Path(".cache") / "http-cache.sqlite"
+HTTP_CACHE_EXPIRY_SECONDS = 12 * 60 * 60
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addoption(
+        "--use-http-cache",
+        action="store_true",
+        default=False,
+        help="Record real httpx responses into .cache/http-cache.sqlite and replay them for 12 hours.",
+    )
+    parser.addini("max_test_duration", "Fail the run when a test not marked slow spends longer than this many seconds in its call phase (0 disables).", default="0.25")
+
+
+def _over_budget(config: pytest.Config) -> list[tuple[str, float]]:
+    budget = float(config.getini("max_test_duration"))
+    reporter = config.pluginmanager.get_plugin("terminalreporter")
+    if budget <= 0 or reporter is None:
+        return []
+    return [(report.nodeid, report.duration) for report in reporter.stats.get("passed", []) if report.when == "call" and report.duration > budget and "slow" not in report.keywords]
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    if exitstatus == pytest.ExitCode.OK and _over_budget(session.config):
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter: Any, exitstatus: int, config: pytest.Config) -> None:
+    offenders = _over_budget(config)
+    if not offenders:
+        return
+    terminalreporter.section("tests over the duration budget", red=True)
+    for nodeid, duration in offenders:
+        terminalreporter.line(f"{duration:.3f}s {nodeid} (mock the slow dependency or mark it @pytest.mark.slow)")
+
+
+class HTTPResponseCache:
+    """
+    SQLite-backed record/replay cache for httpx transports.
+
+    Responses are keyed by method, URL and request body; request headers (and
+    therefore API keys) are never stored. Server-sent event streams pass through
+    untouched because they cannot be replayed from a single body.
+    """
+
+    def __init__(self, path: Path, expiry_seconds: float) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._expiry = expiry_seconds
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, stored REAL, status INTEGER, headers TEXT, body BLOB)")
+
+    def close(self) -> None:
+        self._db.close()
+
+    @staticmethod
+    def key(request: httpx.Request) -> str:
+        digest = hashlib.sha256(f"{request.method} {request.url}\n".encode())
+        digest.update(request.content)
+        return digest.hexdigest()
+
+    def load(self, request: httpx.Request) -> httpx.Response | None:
+        with self._lock:
+            row = self._db.execute("SELECT stored, status, headers, body FROM responses WHERE key = ?", (self.key(request),)).fetchone()
+        if row is None or time.time() - row[0] > self._expiry:
+            return None
+        stored, status, headers, body = row
+        return httpx.Response(status, headers=[tuple(line.split(": ", 1)) for line in headers.splitlines()], content=body, request=request)
+
+    def store(self, request: httpx.Request, response: httpx.Response) -> httpx.Response:
+        # The body is stored decoded, so drop headers that describe the wire encoding.
+        headers = [(name, value) for name, value in response.headers.items() if name not in {"content-encoding", "content-length", "transfer-encoding"}]
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (self.key(request), time.time(), response.status_code, "\n".join(f"{name}: {value}" for name, value in headers), response.content),
+            )
+            self._db.commit()
+        return httpx.Response(response.status_code, headers=headers, content=response.content, request=request)
+
+    @staticmethod
+    def streams_events(response: httpx.Response) -> bool:
+        return response.headers.get("content-type", "").startswith("text/event-stream")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _http_cache(request: pytest.FixtureRequest) -> Iterator[None]:
+    """Install :class:`HTTPResponseCache` on every httpx transport when ``--use-http-cache`` is given."""
+
+    if not request.config.getoption("--use-http-cache"):
+        yield
+        return
+
+    cache = HTTPResponseCache(request.config.rootpath / HTTP_CACHE_PATH, HTTP_CACHE_EXPIRY_SECONDS)
+    handle_request = httpx.HTTPTransport.handle_request
+    handle_async_request = httpx.AsyncHTTPTransport.handle_async_request
+
+    def cached_handle_request(self: httpx.HTTPTransport, http_request: httpx.Request) -> httpx.Response:
+        http_request.read()
+        cached = cache.load(http_request)
+        if cached is not None:
+            return cached
+        response = handle_request(self, http_request)
+        if cache.streams_events(response):
+            return response
+        response.read()
+        return cache.store(http_request, response)
+
+    async def cached_handle_async_request(self: httpx.AsyncHTTPTransport, http_request: httpx.Request) -> httpx.Response:
+        await http_request.aread()
+        cached = cache.load(http_request)
+        if cached is not None:
+            return cached
+        response = await handle_async_request(self, http_request)
+        if cache.streams_events(response):
+            return response
+        await response.aread()
+        return cache.store(http_request, response)
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(httpx.HTTPTransport, "handle_request", cached_handle_request)
+        monkeypatch.setattr(httpx.AsyncHTTPTransport, "handle_async_request", cached_handle_async_request)
+        yield
+    cache.close()
+
+
+class DummyChatModel(BaseChatModel):
+    """Minimal BaseChatModel implementation for deepagents engine tests."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "dummy"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:  # type: ignore[override]
+        generation = ChatGeneration(message=AIMessage(content="ok"))
+        return ChatResult(generations=[generation])
+
+
+@pytest.fixture(autouse=True)
+def _no_sleep(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Skip polling sleeps and Tavily retry backoff so failure paths never wait in real time."""
+
+    monkeypatch.setattr(time, "sleep", lambda *_: None)
+    # Tavily builds its tenacity policy per call, so swapping the wait factory zeroes the backoff.
+    monkeypatch.setattr(tavily_module, "wait_exponential_jitter", lambda **_: wait_none())
+
+
+@pytest.fixture
+def dummy_chat_model() -> DummyChatModel:
+    return DummyChatModel()
+
+
+@pytest.fixture(scope="session")
+def tool_registry() -> Mapping[str, Any]:
+    """Registry snapshot shared by every test in the session."""
+
+    return list_registered_tools()
+
+
+@pytest.fixture(scope="session")
+def deep_agent_tools() -> Mapping[str, Any]:
+    """
+    Keyword arguments captured from one stubbed `create_deep_agent` call.
+
+    The deepagents engine is built once per session with a dummy model; tests
+    inspect the captured ``model``, ``tools`` and ``subagents`` instead of
+    rebuilding the tool list themselves.
+    """
+
+    captured: dict[str, Any] = {}
+
+    def fake_create_deep_agent(*args: Any, **kwargs: Any) -> object:
+        captured.update(kwargs)
+        return captured
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setattr(deep_agent, "create_deep_agent", fake_create_deep_agent)
+        agent = deep_agent.build_workspace_deep_agent(
+            llm=DummyChatModel(),
+            include_shell=False,
+            include_python=False,
+            include_tavily=False,
+            include_document_agent=False,
+            engine="deepagents",
+            include_specialists=True,
+        )
+    assert agent is captured
+    return captured
@@ -1,5 +1,3 @@
-from __future__ import annotations
-
 import textwrap
 
 import pytest
@@ -73,3 +71,30 @@ def test_openai_embedding_client_requires_configuration() -> None:
     secrets = Secrets(openai=None, mcp_servers={}, openai_compatible_embedding=None)
     with pytest.raises(OpenAIEmbeddingError):
         OpenAICompatibleEmbeddingClient(secrets=secrets)
+
+
+def test_openai_embedding_client_embed_batch_orders_rows_by_index(monkeypatch: pytest.MonkeyPatch) -> None:
+    config = OpenAICompatibleEmbeddingSecrets(url="http://localhost:8004/v1", model="test-embedding")
+    client = OpenAICompatibleEmbeddingClient(secrets=Secrets(openai=None, mcp_servers={}, openai_compatible_embedding=config))
+    calls: list[object] = []
+
+    class _StubResponse:
+        def raise_for_status(self) -> None:
+            return None
+
+        def json(self):
+            return {"data": [{"embedding": [0.0, 1.0], "index": 1}, {"embedding": [1.0, 0.0], "index": 0}]}
+
+    def fake_post(self, url: str, *, headers, json):  # type: ignore[no-untyped-def]
+        calls.append(json["input"])
+        return _StubResponse()
+
+    monkeypatch.setattr(OpenAICompatibleEmbeddingClient, "_post", fake_post, raising=False)
+
+    matrix = client.embed_batch(["first", "second"])
+
+    assert calls == [["first", "second"]]
+    assert matrix.shape == (2, 2)
+    assert matrix[0].tolist() == [1.0, 0.0]
+    with pytest.raises(OpenAIEmbeddingError):
+        client.embed_batch(["first", " "])
@@ -0,0 +1,63 @@
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+# Runs inside a pytester session that loads the real conftest with --use-http-cache.
+_INNER_TEST = """
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+hits: list[str] = []
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        hits.append(self.path)
+        body = f'{{"hit": {len(hits)}}}'.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def test_records_then_replays() -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    async def fetch_async() -> list[dict]:
+        async with httpx.AsyncClient() as client:
+            return [(await client.get(f"{base}/async")).json() for _ in range(2)]
+
+    try:
+        sync_bodies = [httpx.get(f"{base}/sync", headers={"Authorization": "Bearer secret"}).json() for _ in range(2)]
+        async_bodies = asyncio.run(fetch_async())
+    finally:
+        server.shutdown()
+
+    assert sync_bodies == [{"hit": 1}, {"hit": 1}]
+    assert async_bodies == [{"hit": 2}, {"hit": 2}]
+    assert hits == ["/sync", "/async"]
+"""
+
+
+@pytest.mark.slow
+def test_http_cache_records_and_replays_sync_and_async_requests(pytester: pytest.Pytester) -> None:
+    pytester.makeconftest(Path(__file__).with_name("conftest.py").read_text(encoding="utf-8"))
+    pytester.makepyfile(test_inner=_INNER_TEST)
+
+    pytester.runpytest("-p", "no:cacheprovider").assert_outcomes(failed=1)
+    pytester.runpytest("--use-http-cache", "-p", "no:cacheprovider").assert_outcomes(passed=1)
+
+    with sqlite3.connect(pytester.path / ".cache" / "http-cache.sqlite") as db:
+        rows = db.execute("SELECT headers, body FROM responses").fetchall()
+    assert len(rows) == 2
+    assert all(b"secret" not in body and "secret" not in headers for headers, body in rows)
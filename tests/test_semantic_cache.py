@@ -0,0 +1,227 @@
+import asyncio
+from typing import Any, Mapping, Sequence
+
+import numpy as np
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_openai import ChatOpenAI
+
+from tiangong_ai_workspace.agents import tools as tools_module
+from tiangong_ai_workspace.agents.tools import create_document_tool
+from tiangong_ai_workspace.secrets import MCPServerSecrets, Secrets
+from tiangong_ai_workspace.tooling.embeddings import EmbeddingResult
+from tiangong_ai_workspace.tooling.llm import CachingChatOpenAI
+from tiangong_ai_workspace.tooling.semantic_cache import LLMSemanticCache, LSHIndex
+from tiangong_ai_workspace.tooling.tavily import TavilySearchClient
+
+_VECTORS: Mapping[str, list[float]] = {
+    "solar panel efficiency": [1.0, 0.0, 0.0],
+    "efficiency of solar panels": [0.95, 0.05, 0.0],
+    "battery recycling": [0.0, 1.0, 0.0],
+}
+
+
+class _StubEmbeddingClient:
+    def __init__(self) -> None:
+        self.calls: list[Sequence[str]] = []
+
+    def embed(self, inputs: Sequence[str], **_: Any) -> EmbeddingResult:
+        self.calls.append(list(inputs))
+        vectors = [_VECTORS[text] for text in inputs]
+        return EmbeddingResult(embeddings=vectors, model="stub", dimensions=3, usage=None, raw_response={})
+
+    def embed_batch(self, texts: Sequence[str]) -> np.ndarray:
+        return np.asarray(self.embed(texts).embeddings, dtype=np.float32)
+
+
+def test_semantic_cache_exact_hit_skips_compute_and_embedding() -> None:
+    embedder = _StubEmbeddingClient()
+    cache = LLMSemanticCache(embedding_client=embedder)  # type: ignore[arg-type]
+    calls: list[str] = []
+
+    def compute() -> Mapping[str, Any]:
+        calls.append("hit")
+        return {"answer": 1}
+
+    first = cache.get_or_compute({"query": "solar panel efficiency"}, compute, text="solar panel efficiency")
+    second = cache.get_or_compute({"query": "solar panel efficiency"}, compute, text="solar panel efficiency")
+
+    assert first == second == {"answer": 1}
+    assert calls == ["hit"]
+    assert len(embedder.calls) == 1
+
+
+def test_semantic_cache_reuses_similar_prompt_within_scope() -> None:
+    cache = LLMSemanticCache(embedding_client=_StubEmbeddingClient())  # type: ignore[arg-type]
+    scope = {"service": "tavily"}
+
+    cache.get_or_compute({"query": "solar panel efficiency"}, lambda: "original", text="solar panel efficiency", scope=scope)
+    similar = cache.get_or_compute({"query": "efficiency of solar panels"}, lambda: "fresh", text="efficiency of solar panels", scope=scope)
+    unrelated = cache.get_or_compute({"query": "battery recycling"}, lambda: "fresh", text="battery recycling", scope=scope)
+    other_scope = cache.get_or_compute({"query": "efficiency of solar panels", "n": 5}, lambda: "scoped", text="efficiency of solar panels", scope={"service": "other"})
+
+    assert similar == "original"
+    assert unrelated == "fresh"
+    assert other_scope == "scoped"
+
+
+def test_semantic_cache_warm_embeds_entries_in_one_batch() -> None:
+    embedder = _StubEmbeddingClient()
+    cache = LLMSemanticCache(embedding_client=embedder)  # type: ignore[arg-type]
+
+    stored = cache.warm(
+        [
+            ({"query": "solar panel efficiency"}, "solar", "solar panel efficiency"),
+            ({"query": "battery recycling"}, "battery", "battery recycling"),
+        ]
+    )
+    similar = cache.get_or_compute({"query": "efficiency of solar panels"}, lambda: "fresh", text="efficiency of solar panels")
+
+    assert stored == 2
+    assert similar == "solar"
+    assert embedder.calls[0] == ["solar panel efficiency", "battery recycling"]
+
+
+def test_semantic_cache_bounds_exact_and_similarity_tiers() -> None:
+    cache = LLMSemanticCache(embedding_client=_StubEmbeddingClient(), max_entries=2)  # type: ignore[arg-type]
+    for query in ("solar panel efficiency", "battery recycling"):
+        cache.get_or_compute({"query": query}, lambda: query, text=query)
+    cache.get_or_compute({"query": "solar panel efficiency"}, lambda: "recomputed")
+    cache.get_or_compute({"query": "new"}, lambda: "new")
+
+    assert len(cache) == 2
+    assert cache.get_or_compute({"query": "solar panel efficiency"}, lambda: "recomputed") == "solar panel efficiency"
+    assert cache.get_or_compute({"query": "battery recycling"}, lambda: "evicted") == "evicted"
+
+    # A threshold above 1 disables similarity hits so every call adds a row to the scope.
+    unmatched = LLMSemanticCache(embedding_client=_StubEmbeddingClient(), similarity_threshold=1.01, max_entries=2)  # type: ignore[arg-type]
+    for query in _VECTORS:
+        unmatched.get_or_compute({"query": query}, lambda: query, text=query)
+    store = unmatched._stores["__default__"]
+    assert len(store.responses) == len(store.index) == 1
+    assert store.responses == ["battery recycling"]
+
+
+def test_tavily_client_consults_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    secrets = Secrets(
+        openai=None,
+        mcp_servers={"tavily": MCPServerSecrets(service_name="tavily", transport="streamable_http", url="https://example.com")},
+    )
+    client = TavilySearchClient(secrets=secrets, cache=LLMSemanticCache())
+    calls: list[str] = []
+
+    async def fake_search(self, query: str, payload: Mapping[str, Any]) -> Mapping[str, Any]:
+        calls.append(query)
+        return {"query": query, "result": ["A"]}
+
+    monkeypatch.setattr(TavilySearchClient, "_search_async", fake_search)
+
+    assert client.search("solar")["result"] == ["A"]
+    assert client.search("solar")["result"] == ["A"]
+    client.search("solar", options={"max_results": 3})
+    assert calls == ["solar", "solar"]
+
+
+def test_lsh_index_finds_near_duplicate_among_many_rows() -> None:
+    rng = np.random.default_rng(7)
+    vectors = rng.standard_normal((2000, 64)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    index = LSHIndex(num_hash_tables=6)
+    for vector in vectors:
+        index.add(vector)
+
+    probe = vectors[1234] + 0.05 * rng.standard_normal(64).astype(np.float32)
+    probe /= np.linalg.norm(probe)
+    match = index.query(probe)
+
+    assert len(index) == 2000
+    assert match is not None
+    assert match[0] == 1234
+    assert match[1] > 0.9
+
+
+def _counting_generate(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    calls: list[str] = []
+
+    def fake_generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:  # type: ignore[no-untyped-def]
+        calls.append(str(messages[-1].content))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=f"answer {len(calls)}"))])
+
+    monkeypatch.setattr(ChatOpenAI, "_generate", fake_generate)
+    return calls
+
+
+def test_caching_chat_model_hits_ignore_message_ids_and_return_fresh_messages(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _counting_generate(monkeypatch)
+    model = CachingChatOpenAI(api_key="sk-test", model="gpt-test", temperature=0, response_cache=LLMSemanticCache())
+
+    first = model.invoke([HumanMessage(content="solar panel efficiency", id="1")])
+    second = model.invoke([HumanMessage(content="solar panel efficiency", id="2")])
+    other = model.invoke([HumanMessage(content="battery recycling", id="3")])
+
+    assert calls == ["solar panel efficiency", "battery recycling"]
+    assert first.content == second.content == "answer 1"
+    assert first is not second and first.id != second.id
+    assert other.content == "answer 2"
+
+
+@pytest.mark.parametrize("temperature, expected_calls", [(0.0, 2), (0.7, 1)], ids=["deterministic-exact-only", "sampled-semantic"])
+def test_caching_chat_model_only_matches_semantically_when_sampling(monkeypatch: pytest.MonkeyPatch, temperature: float, expected_calls: int) -> None:
+    calls = _counting_generate(monkeypatch)
+    cache = LLMSemanticCache(embedding_client=_StubEmbeddingClient())  # type: ignore[arg-type]
+    model = CachingChatOpenAI(api_key="sk-test", model="gpt-test", temperature=temperature, response_cache=cache)
+
+    model.invoke([HumanMessage(content="solar panel efficiency")])
+    model.invoke([HumanMessage(content="efficiency of solar panels")])
+
+    assert len(calls) == expected_calls
+
+
+def test_caching_chat_model_only_reuses_similar_turns_after_identical_history(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = _counting_generate(monkeypatch)
+    cache = LLMSemanticCache(embedding_client=_StubEmbeddingClient())  # type: ignore[arg-type]
+    model = CachingChatOpenAI(api_key="sk-test", model="gpt-test", temperature=0.7, response_cache=cache)
+
+    first = model.invoke([HumanMessage(content="solar panel efficiency")])
+    model.invoke([HumanMessage(content="solar panel efficiency"), first, HumanMessage(content="efficiency of solar panels")])
+
+    assert calls == ["solar panel efficiency", "efficiency of solar panels"]
+
+
+def test_caching_chat_model_caches_async_calls(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[str] = []
+
+    async def fake_agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:  # type: ignore[no-untyped-def]
+        calls.append(str(messages[-1].content))
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=f"answer {len(calls)}"))])
+
+    monkeypatch.setattr(ChatOpenAI, "_agenerate", fake_agenerate)
+    model = CachingChatOpenAI(api_key="sk-test", model="gpt-test", temperature=0, response_cache=LLMSemanticCache())
+
+    async def scenario() -> list[Any]:
+        return [await model.ainvoke([HumanMessage(content="solar panel efficiency")]) for _ in range(2)]
+
+    first, second = asyncio.run(scenario())
+    assert calls == ["solar panel efficiency"]
+    assert first.content == second.content == "answer 1"
+    assert first.id != second.id
+
+
+def test_document_tool_reuses_cached_workflow_result(monkeypatch: pytest.MonkeyPatch) -> None:
+    runs: list[str] = []
+
+    def fake_workflow(config: Any) -> Mapping[str, Any]:
+        runs.append(config.topic)
+        return {"draft": f"draft {len(runs)}"}
+
+    monkeypatch.setattr(tools_module, "run_document_workflow", fake_workflow)
+    tool = create_document_tool(cache=LLMSemanticCache())
+
+    first = tool.invoke({"workflow": "report", "topic": "Solar"})
+    second = tool.invoke({"workflow": "report", "topic": "Solar"})
+    third = tool.invoke({"workflow": "report", "topic": "Wind"})
+
+    assert first["data"] == second["data"] == {"draft": "draft 1"}
+    assert third["data"] == {"draft": "draft 2"}
+    assert runs == ["Solar", "Wind"]
@@ -1,41 +1,88 @@
-from __future__ import annotations
-
+import asyncio
+import dataclasses
+import inspect
+import io
 import json
-from typing import Any, Mapping
-
+import os
+import subprocess
+import time
+from collections import deque
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Literal, Mapping
+
+import httpx
+import msgspec
 import pytest
 from langchain_core.language_models.chat_models import BaseChatModel
-from langchain_core.messages import AIMessage, HumanMessage
-from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.messages import HumanMessage, ToolMessage
 from langchain_core.runnables import Runnable
 
+from tiangong_ai_workspace.agents import deep_agent as deep_agent_module
 from tiangong_ai_workspace.agents.deep_agent import build_workspace_deep_agent
-from tiangong_ai_workspace.secrets import DifyKnowledgeBaseSecrets, GeminiSecrets, MCPServerSecrets, Neo4jSecrets, Secrets
+from tiangong_ai_workspace.agents.tools import create_tavily_tool
+from tiangong_ai_workspace.secrets import DifyKnowledgeBaseSecrets, GeminiSecrets, MCPServerSecrets, Neo4jSecrets, OpenAISecrets, Secrets, load_secrets
 from tiangong_ai_workspace.tooling import (
     GeminiDeepResearchClient,
     PythonExecutor,
     ShellExecutor,
+    ToolDescriptor,
     WorkspaceResponse,
     list_registered_tools,
 )
+from tiangong_ai_workspace.tooling import registry as registry_module
+from tiangong_ai_workspace.tooling import tavily as tavily_module
 from tiangong_ai_workspace.tooling.crossref import CrossrefClient, CrossrefClientError
 from tiangong_ai_workspace.tooling.dify import DifyKnowledgeBaseClient, DifyKnowledgeBaseError
 from tiangong_ai_workspace.tooling.gemini import GeminiDeepResearchError
+from tiangong_ai_workspace.tooling.llm import ModelRouter
 from tiangong_ai_workspace.tooling.neo4j import Neo4jClient, Neo4jToolError
 from tiangong_ai_workspace.tooling.openalex import OpenAlexClient
 from tiangong_ai_workspace.tooling.tavily import TavilySearchClient, TavilySearchError
 
+# Shared, immutable secrets; the dataclasses are frozen so tests can reuse them safely.
+_EMPTY_SECRETS = Secrets(openai=None, mcp_servers=MappingProxyType({}))
+_MCP_SECRETS = Secrets(
+    openai=None,
+    mcp_servers=MappingProxyType({name: MCPServerSecrets(service_name=name, transport="streamable_http", url="https://example.com") for name in ("tavily", "custom", "flaky")}),
+)
+
 
-def test_workspace_response_json_roundtrip() -> None:
-    response = WorkspaceResponse.ok(payload={"value": 42}, message="All good", request_id="abc123")
-    payload = json.loads(response.to_json())
-    assert payload["status"] == "success"
-    assert payload["payload"] == {"value": 42}
-    assert payload["metadata"]["request_id"] == "abc123"
+class _ResponseView(msgspec.Struct, omit_defaults=True):
+    """Typed view of `WorkspaceResponse.to_json()` output; decoding validates the envelope shape."""
+
+    status: Literal["success", "warning", "error"]
+    message: str
+    payload: Any = None
+    errors: list[str] = []
+    metadata: dict[str, Any] = {}
+
+
+@pytest.mark.parametrize(
+    "response, expected",
+    [
+        (
+            WorkspaceResponse.ok(payload={"value": 42}, message="All good", request_id="abc123"),
+            {"status": "success", "message": "All good", "payload": {"value": 42}, "metadata": {"request_id": "abc123"}},
+        ),
+        (
+            WorkspaceResponse.warn("Partial", payload=[1, 2], errors=("slow",)),
+            {"status": "warning", "message": "Partial", "payload": [1, 2], "errors": ["slow"]},
+        ),
+        (
+            WorkspaceResponse.error("Boom", errors=("bad input",), request_id="xyz"),
+            {"status": "error", "message": "Boom", "errors": ["bad input"], "metadata": {"request_id": "xyz"}},
+        ),
+    ],
+    ids=["ok", "warn", "error"],
+)
+def test_workspace_response_json_roundtrip(response: WorkspaceResponse, expected: Mapping[str, Any]) -> None:
+    view = msgspec.json.decode(response.to_json(), type=_ResponseView)
+    assert msgspec.to_builtins(view) == expected
 
 
-def test_tool_registry_contains_core_workflows() -> None:
-    registry = list_registered_tools()
+def test_tool_registry_contains_core_workflows(tool_registry: Mapping[str, Any]) -> None:
+    registry = tool_registry
     assert "docs.report" in registry
     assert registry["docs.report"].category == "workflow"
     assert "agents.deep" in registry
@@ -48,31 +95,150 @@ def test_tool_registry_contains_core_workflows() -> None:
     assert "research.gemini_deep_research" in registry
 
 
-def test_tavily_client_missing_service_raises() -> None:
-    secrets = Secrets(openai=None, mcp_servers={})
-    with pytest.raises(TavilySearchError):
-        TavilySearchClient(secrets=secrets)
+def test_list_registered_tools_is_cached_until_registration(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(registry_module, "_TOOL_REGISTRY", dict(registry_module._TOOL_REGISTRY))
+    list_registered_tools.cache_clear()
+    snapshot = list_registered_tools()
+    assert list_registered_tools() is snapshot
+    with pytest.raises(TypeError):
+        snapshot["extra"] = None  # type: ignore[index]
 
+    registry_module.register_tool(ToolDescriptor(name="test.extra", description="Extra", category="test", entrypoint="tests:extra"))
+    assert "test.extra" in list_registered_tools()
+    assert "test.extra" not in snapshot
+    list_registered_tools.cache_clear()
 
-def test_tavily_client_custom_service_is_loaded() -> None:
-    secrets = Secrets(
-        openai=None,
-        mcp_servers={
-            "custom": MCPServerSecrets(
-                service_name="custom",
-                transport="streamable_http",
-                url="https://example.com",
-            )
-        },
-    )
-    client = TavilySearchClient(secrets=secrets, service_name="custom")
-    assert client.service_name == "custom"
+
+def test_load_secrets_is_memoised_until_file_changes(tmp_path: Path) -> None:
+    secrets_file = tmp_path / "secrets.toml"
+    secrets_file.write_text('[openai]\napi_key = "sk-one"\n', encoding="utf-8")
+
+    first = load_secrets(path=secrets_file)
+    assert load_secrets(path=secrets_file) is first
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        first.openai = None  # type: ignore[misc]
+
+    secrets_file.write_text('[openai]\napi_key = "sk-two"\n', encoding="utf-8")
+    stat = secrets_file.stat()
+    os.utime(secrets_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert load_secrets(path=secrets_file).openai.api_key == "sk-two"  # type: ignore[union-attr]
+
+
+def test_model_router_selects_models_and_reuses_instances() -> None:
+    secrets = Secrets(openai=OpenAISecrets(api_key="sk-test", chat_model="gpt-chat", deep_research_model="gpt-research"), mcp_servers={})
+    router = ModelRouter(secrets=secrets)
+
+    general = router.create_chat_model()
+    assert general.model_name == "gpt-chat"
+    assert router.create_chat_model(purpose="deep_research").model_name == "gpt-research"
+    assert ModelRouter(secrets=secrets).create_chat_model() is general
+
+
+@pytest.mark.parametrize(
+    "secrets, service, expect",
+    [
+        (_EMPTY_SECRETS, "tavily", TavilySearchError),
+        (_MCP_SECRETS, "custom", "custom"),
+    ],
+    ids=["missing", "custom"],
+)
+def test_tavily_client_service_resolution(secrets: Secrets, service: str, expect: Any) -> None:
+    if isinstance(expect, type):
+        with pytest.raises(expect):
+            TavilySearchClient(secrets=secrets, service_name=service)
+    else:
+        assert TavilySearchClient(secrets=secrets, service_name=service).service_name == expect
+
+
+def test_tavily_client_is_configured_checks_mcp_entries() -> None:
+    assert TavilySearchClient.is_configured(_MCP_SECRETS)
+    assert not TavilySearchClient.is_configured(_MCP_SECRETS, service_name="other")
+
+
+def test_tavily_client_circuit_breaker_short_circuits_dead_service(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = TavilySearchClient(secrets=_MCP_SECRETS, service_name="flaky")
+    monkeypatch.setitem(TavilySearchClient._breakers, "flaky", tavily_module._CircuitBreaker(fail_max=3))
+    calls: list[str] = []
+
+    async def failing_invoke(config: MCPServerSecrets, tool_name: str, arguments: Mapping[str, Any]) -> Any:
+        calls.append(tool_name)
+        raise RuntimeError("service down")
+
+    monkeypatch.setattr(tavily_module, "ainvoke_tool", failing_invoke)
+
+    with pytest.raises(TavilySearchError, match="service down"):
+        client.search("solar")
+    with pytest.raises(TavilySearchError, match="Circuit open"):
+        client.search("solar")
+    assert len(calls) == 3
+
+
+def test_circuit_breaker_half_opens_for_a_single_trial() -> None:
+    breaker = tavily_module._CircuitBreaker(fail_max=1, reset_timeout=60)
+    calls: list[str] = []
+
+    async def fail() -> None:
+        raise RuntimeError("down")
+
+    async def probe() -> str:
+        calls.append("probe")
+        await asyncio.sleep(0)
+        return "ok"
+
+    async def scenario() -> list[Any]:
+        with pytest.raises(RuntimeError):
+            await breaker.call_async(fail)
+        with pytest.raises(tavily_module._CircuitOpenError):
+            await breaker.call_async(probe)
+        breaker._opened_at -= breaker.reset_timeout  # type: ignore[operator]
+        outcomes = await asyncio.gather(*(breaker.call_async(probe) for _ in range(3)), return_exceptions=True)
+        outcomes.append(await breaker.call_async(probe))
+        return outcomes
+
+    outcomes = asyncio.run(scenario())
+    assert outcomes[0] == "ok"
+    assert all(isinstance(outcome, tavily_module._CircuitOpenError) for outcome in outcomes[1:3])
+    assert outcomes[3] == "ok"
+    assert calls == ["probe", "probe"]
+
+
+def test_circuit_breaker_failed_trial_reopens() -> None:
+    breaker = tavily_module._CircuitBreaker(fail_max=1, reset_timeout=60)
+
+    async def fail() -> None:
+        raise RuntimeError("down")
+
+    async def scenario() -> None:
+        with pytest.raises(RuntimeError):
+            await breaker.call_async(fail)
+        breaker._opened_at -= breaker.reset_timeout  # type: ignore[operator]
+        with pytest.raises(RuntimeError):
+            await breaker.call_async(fail)
+        with pytest.raises(tavily_module._CircuitOpenError):
+            await breaker.call_async(fail)
+
+    asyncio.run(scenario())
+
+
+CASSETTES = Path(__file__).parent / "cassettes"
+
+
+def test_tavily_client_search_returns_results(monkeypatch: pytest.MonkeyPatch) -> None:
+    cassette = json.loads((CASSETTES / "tavily_search.json").read_text(encoding="utf-8"))
+
+    async def replay(config: MCPServerSecrets, tool_name: str, arguments: Mapping[str, Any]) -> Any:
+        assert (tool_name, dict(arguments)) == (cassette["tool"], cassette["arguments"])
+        return cassette["result"], cassette["attachments"]
+
+    monkeypatch.setattr(tavily_module, "ainvoke_tool", replay)
+    response = TavilySearchClient(secrets=_MCP_SECRETS).search("lithium battery recycling", options={"max_results": 2})
+
+    assert response == {"query": "lithium battery recycling", "result": cassette["result"]}
 
 
 def test_dify_client_missing_configuration_raises() -> None:
-    secrets = Secrets(openai=None, mcp_servers={})
     with pytest.raises(DifyKnowledgeBaseError):
-        DifyKnowledgeBaseClient(secrets=secrets)
+        DifyKnowledgeBaseClient(secrets=_EMPTY_SECRETS)
 
 
 def test_dify_client_retrieve(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -87,12 +253,11 @@ def test_dify_client_retrieve(monkeypatch: pytest.MonkeyPatch) -> None:
     captured: dict[str, Any] = {}
 
     class _StubResponse:
+        content = json.dumps({"chunks": ["A"], "hit": True}).encode()
+
         def raise_for_status(self) -> None:
             return None
 
-        def json(self) -> Mapping[str, Any]:
-            return {"chunks": ["A"], "hit": True}
-
     def fake_post(self, url: str, *, headers: Mapping[str, str], json: Mapping[str, Any]):
         captured["url"] = url
         captured["headers"] = headers
@@ -120,6 +285,84 @@ def test_dify_client_retrieve(monkeypatch: pytest.MonkeyPatch) -> None:
     assert captured["headers"]["Authorization"] == "Bearer dataset-123"
 
 
+def test_dify_client_reuses_pooled_http_client() -> None:
+    config = DifyKnowledgeBaseSecrets(api_base_url="https://example.com/v1", api_key="dataset-123", dataset_id="abc")
+    secrets = Secrets(openai=None, mcp_servers={}, dify_knowledge_base=config)
+
+    with DifyKnowledgeBaseClient(secrets=secrets) as client:
+        pooled = client._client()
+        assert client._client() is pooled
+    assert pooled.is_closed
+    assert client.http_client is None
+
+    requests: list[httpx.Request] = []
+    transport = httpx.MockTransport(lambda request: requests.append(request) or httpx.Response(200, json={"records": []}))
+    external = httpx.Client(transport=transport)
+    with DifyKnowledgeBaseClient(secrets=secrets, http_client=external) as client:
+        client.retrieve("first")
+        client.retrieve("second")
+    assert not external.is_closed
+    assert [request.url.path for request in requests] == ["/v1/datasets/abc/retrieve"] * 2
+    assert requests[0].headers["Authorization"] == "Bearer dataset-123"
+
+
+def test_dify_client_async_paths_use_injected_async_client() -> None:
+    config = DifyKnowledgeBaseSecrets(api_base_url="https://example.com/v1", api_key="dataset-123", dataset_id="abc")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        return httpx.Response(200, json={"echo": body["query"], "top_k": body["retrieval_model"]["top_k"], "auth": request.headers["Authorization"]})
+
+    external = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client = DifyKnowledgeBaseClient(secrets=dataclasses.replace(_EMPTY_SECRETS, dify_knowledge_base=config), async_http_client=external)
+
+    async def scenario() -> tuple[list[Mapping[str, Any]], Mapping[str, Any]]:
+        batch = await client.batch_retrieve(["alpha", "beta", "gamma"], top_k=2)
+        single = await client.retrieve_async("delta", top_k=1)
+        return batch, single
+
+    results, single = asyncio.run(scenario())
+
+    assert [item["query"] for item in results] == ["alpha", "beta", "gamma"]
+    assert [item["result"]["echo"] for item in results] == ["alpha", "beta", "gamma"]
+    assert results[0]["result"]["top_k"] == 2
+    assert single["result"] == {"echo": "delta", "top_k": 1, "auth": "Bearer dataset-123"}
+    assert not external.is_closed
+
+
+def test_tavily_tool_batches_list_queries(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def fake_search_async(self, query: str, payload: Mapping[str, Any]) -> Mapping[str, Any]:
+        return {"query": query, "result": payload}
+
+    monkeypatch.setattr(TavilySearchClient, "_search_async", fake_search_async)
+    tavily_tool = create_tavily_tool(TavilySearchClient(secrets=_MCP_SECRETS))
+
+    output = tavily_tool.invoke({"query": ["solar", "wind"], "options": {"max_results": 2}})
+
+    assert output["status"] == "success"
+    assert [item["query"] for item in output["data"]["results"]] == ["solar", "wind"]
+    assert output["data"]["results"][1]["result"]["max_results"] == 2
+
+
+def test_tavily_tool_keeps_successful_results_when_a_query_fails(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def fake_search_async(self, query: str, payload: Mapping[str, Any]) -> Mapping[str, Any]:
+        if query == "wind":
+            raise TavilySearchError("upstream timeout")
+        return {"query": query, "result": payload}
+
+    monkeypatch.setattr(TavilySearchClient, "_search_async", fake_search_async)
+    tavily_tool = create_tavily_tool(TavilySearchClient(secrets=_MCP_SECRETS))
+
+    output = tavily_tool.invoke({"query": ["solar", "wind", "hydro"]})
+    failed = tavily_tool.invoke({"query": ["wind"]})
+
+    assert output["status"] == "success"
+    assert output["message"] == "wind: upstream timeout"
+    assert [item["query"] for item in output["data"]["results"]] == ["solar", "wind", "hydro"]
+    assert output["data"]["results"][1] == {"query": "wind", "status": "error", "message": "upstream timeout"}
+    assert failed["status"] == "error"
+
+
 def test_crossref_client_list_journal_works(monkeypatch: pytest.MonkeyPatch) -> None:
     client = CrossrefClient(timeout=1.0)
     captured: dict[str, Any] = {}
@@ -224,9 +467,8 @@ def test_openalex_client_cited_by(monkeypatch: pytest.MonkeyPatch) -> None:
 
 
 def test_gemini_client_missing_configuration_raises() -> None:
-    secrets = Secrets(openai=None, mcp_servers={})
     with pytest.raises(GeminiDeepResearchError):
-        GeminiDeepResearchClient(secrets=secrets)
+        GeminiDeepResearchClient(secrets=_EMPTY_SECRETS)
 
 
 def test_gemini_client_start_research_builds_payload(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -273,7 +515,6 @@ def test_gemini_client_poll_until_complete(monkeypatch: pytest.MonkeyPatch) -> N
         return {"interaction_id": interaction_id, "status": "completed", "interaction": {"outputs": [{"text": "done"}]}}
 
     monkeypatch.setattr(GeminiDeepResearchClient, "get_interaction", fake_get, raising=False)
-    monkeypatch.setattr("tiangong_ai_workspace.tooling.gemini.time.sleep", lambda _: None)
 
     result = client.poll_until_complete("abc", interval=0.0, max_attempts=3)
     assert result["status"] == "completed"
@@ -289,17 +530,119 @@ def test_gemini_client_poll_until_failure(monkeypatch: pytest.MonkeyPatch) -> No
         return {"interaction_id": interaction_id, "status": "failed", "interaction": {"error": "boom"}}
 
     monkeypatch.setattr(GeminiDeepResearchClient, "get_interaction", fake_get, raising=False)
-    monkeypatch.setattr("tiangong_ai_workspace.tooling.gemini.time.sleep", lambda _: None)
 
     with pytest.raises(GeminiDeepResearchError):
         client.poll_until_complete("abc", interval=0.0, max_attempts=2)
 
 
+class FakeProcess:
+    """In-process stand-in for `subprocess.Popen` used by the shell executor tests."""
+
+    def __init__(self, stdout: str = "", stderr: str = "", returncode: int = 0) -> None:
+        self.stdout = io.StringIO(stdout)
+        self.stderr = io.StringIO(stderr)
+        self.returncode = returncode
+
+    def wait(self, timeout: float | None = None) -> int:
+        return self.returncode
+
+    def kill(self) -> None:
+        pass
+
+
 def test_shell_executor_runs_command() -> None:
-    executor = ShellExecutor()
+    calls: list[str] = []
+
+    def runner(command: str, **kwargs: Any) -> FakeProcess:
+        calls.append(command)
+        assert kwargs["shell"] is True
+        return FakeProcess(stdout="hello\n")
+
+    executor = ShellExecutor(runner=runner)
     result = executor.run("echo hello")
+    assert calls == ["echo hello"]
     assert result.exit_code == 0
-    assert "hello" in result.stdout.lower()
+    assert result.stdout == "hello\n"
+    assert result.to_dict()["cwd"] == str(executor.workdir)
+
+
+def test_shell_executor_streams_lines_to_callback() -> None:
+    streamed: list[str] = []
+    executor = ShellExecutor(max_output_lines=2, runner=lambda command, **_: FakeProcess(stdout="a\nb\nc\n", stderr="oops\n", returncode=3))
+    result = executor.run("emit", on_stdout=streamed.append)
+    assert streamed == ["a\n", "b\n", "c\n"]
+    assert result.exit_code == 3
+    assert result.stdout == "b\nc\n"
+    assert result.stderr == "oops\n"
+
+
+def test_shell_executor_keeps_draining_after_callback_fails() -> None:
+    def explode(line: str) -> None:
+        raise RuntimeError(f"callback rejected {line!r}")
+
+    class RecordingStream(io.StringIO):
+        drained: list[str] = []
+
+        def __next__(self) -> str:
+            line = super().__next__()
+            self.drained.append(line)
+            return line
+
+    process = FakeProcess()
+    process.stdout = RecordingStream("first\nsecond\ndone\n")
+    with pytest.raises(RuntimeError, match="callback rejected 'first"):
+        ShellExecutor(runner=lambda command, **_: process).run("emit", on_stdout=explode)
+    assert RecordingStream.drained == ["first\n", "second\n", "done\n"]
+
+
+def test_shell_executor_kills_command_that_outlives_timeout() -> None:
+    class HangingProcess(FakeProcess):
+        killed = False
+
+        def wait(self, timeout: float | None = None) -> int:
+            if timeout is not None and not self.killed:
+                raise subprocess.TimeoutExpired("hang", timeout)
+            return -9
+
+        def kill(self) -> None:
+            self.killed = True
+
+    process = HangingProcess(stdout="partial\n")
+    with pytest.raises(subprocess.TimeoutExpired) as excinfo:
+        ShellExecutor(runner=lambda command, **_: process).run("hang", timeout=5)
+    assert process.killed
+    assert excinfo.value.timeout == 5
+
+
+def test_shell_executor_times_out_when_background_child_holds_pipes() -> None:
+    read_fd, write_fd = os.pipe()
+
+    class DetachedChildProcess(FakeProcess):
+        # The shell exits at once, but a "background child" keeps stdout open.
+        def kill(self) -> None:
+            os.close(write_fd)
+
+    process = DetachedChildProcess()
+    process.stdout = os.fdopen(read_fd, encoding="utf-8")
+    started = time.perf_counter()
+    with pytest.raises(subprocess.TimeoutExpired):
+        ShellExecutor(runner=lambda command, **_: process).run("daemon &", timeout=0.1)
+    assert time.perf_counter() - started < 1
+
+
+@pytest.mark.slow
+def test_shell_executor_replaces_invalid_utf8() -> None:
+    result = ShellExecutor().run("printf 'ok\\n\\377\\376 bad\\nafter\\n'")
+    assert result.exit_code == 0
+    assert result.stdout == "ok\n\ufffd\ufffd bad\nafter\n"
+
+
+@pytest.mark.slow
+def test_shell_executor_runs_real_subprocess() -> None:
+    result = ShellExecutor().run("printf 'a\\nb\\n'; echo oops >&2")
+    assert result.exit_code == 0
+    assert result.stdout == "a\nb\n"
+    assert result.stderr == "oops\n"
 
 
 def test_python_executor_captures_output() -> None:
@@ -307,6 +650,36 @@ def test_python_executor_captures_output() -> None:
     result = executor.run("print('hi')")
     assert "hi" in result.stdout
     assert result.stderr == ""
+    assert executor.globals_snapshot()["__name__"] == "__agent_exec__"
+    assert json.loads(result.to_json())["stdout"] == result.stdout
+
+
+def test_python_executor_runs_in_process() -> None:
+    result = PythonExecutor().run("import os\nprint(os.getpid())")
+    assert result.stdout.strip() == str(os.getpid())
+
+
+def test_python_executor_decodes_unicode_output_and_tracebacks() -> None:
+    result = PythonExecutor().run("print('温度')\nraise ValueError('坏')")
+    assert result.stdout == "温度\n"
+    assert "ValueError: 坏" in result.stderr
+
+
+def test_python_executor_dedents_indented_snippets() -> None:
+    result = PythonExecutor().run("\n    value = 2\n    print(value * 21)\n")
+    assert result.stdout == "42\n"
+    assert result.code.startswith("\nvalue = 2")
+
+
+def test_python_executor_reuses_compiled_code() -> None:
+    executor = PythonExecutor(code_cache_size=1)
+    first = executor.run("print('cached')")
+    cached = next(iter(executor._code_cache.values()))
+    second = executor.run("print('cached')")
+    assert next(iter(executor._code_cache.values())) is cached
+    assert first.stdout == second.stdout == "cached\n"
+    executor.run("print('other')")
+    assert len(executor._code_cache) == 1
 
 
 def test_neo4j_client_executes_with_stub_driver() -> None:
@@ -324,19 +697,19 @@ def test_neo4j_client_executes_with_stub_driver() -> None:
 
 def test_neo4j_client_without_configuration_raises() -> None:
     with pytest.raises(Neo4jToolError):
-        Neo4jClient(secrets=Secrets(openai=None, mcp_servers={}, neo4j=None))
+        Neo4jClient(secrets=_EMPTY_SECRETS)
 
 
 class StubPlanner(Runnable):
     """Deterministic planner used for testing the workspace agent."""
 
     def __init__(self, responses: list[str]) -> None:
-        self._responses = responses
+        self._responses = deque(responses)
 
     def invoke(self, _: Any, config: Any | None = None) -> str:  # type: ignore[override]
         if not self._responses:
             raise RuntimeError("StubPlanner has no responses left")
-        return self._responses.pop(0)
+        return self._responses.popleft()
 
 
 def test_build_workspace_deep_agent_runs_to_completion() -> None:
@@ -356,39 +729,54 @@ def test_build_workspace_deep_agent_runs_to_completion() -> None:
     assert result["final_response"] == "Completed task."
 
 
-class DummyChatModel(BaseChatModel):
-    """Minimal BaseChatModel implementation for deepagents engine tests."""
+def test_build_workspace_deep_agent_fans_out_parallel_actions() -> None:
+    plan = {
+        "thought": "Both snippets are independent.",
+        "action": "parallel",
+        "input": [{"action": "python", "input": {"code": "print('first')"}}, {"action": "python", "input": {"code": "print('second')"}}],
+    }
+    planner = StubPlanner([json.dumps(plan), '{"action": "finish", "final_response": "Done."}'])
+    agent = build_workspace_deep_agent(
+        llm=planner,
+        include_shell=False,
+        include_tavily=False,
+        include_dify_knowledge=False,
+        include_document_agent=False,
+        include_neo4j=False,
+        include_crossref=False,
+        include_openalex=False,
+    )
+    result = agent.invoke({"messages": [HumanMessage(content="Run both")], "iterations": 0})
 
-    @property
-    def _llm_type(self) -> str:
-        return "dummy"
+    observations = [message.content for message in result["messages"] if isinstance(message, ToolMessage)]
+    assert result["final_response"] == "Done."
+    assert len(observations) == 2
+    assert [json.loads(observation)["stdout"] for observation in observations] == ["first\n", "second\n"]
+    assert all(json.loads(observation)["stderr"] == "" for observation in observations)
+    assert result["parallel_results"] == []
 
-    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:  # type: ignore[override]
-        generation = ChatGeneration(message=AIMessage(content="ok"))
-        return ChatResult(generations=[generation])
 
+def test_build_workspace_deep_agent_deepagents_engine(deep_agent_tools: Mapping[str, Any]) -> None:
+    model = deep_agent_tools["model"]
+    assert isinstance(model, BaseChatModel)
+    assert deep_agent_tools["tools"]
+    assert "writer" not in {subagent["name"] for subagent in deep_agent_tools["subagents"]}
+    assert all(subagent["model"] is model for subagent in deep_agent_tools["subagents"])
 
-def test_build_workspace_deep_agent_deepagents_engine(monkeypatch: pytest.MonkeyPatch) -> None:
-    dummy_model = DummyChatModel()
-    stub_agent = object()
 
-    def fake_create_deep_agent(*args, **kwargs):
-        fake_create_deep_agent.called = True  # type: ignore[attr-defined]
-        fake_create_deep_agent.kwargs = kwargs  # type: ignore[attr-defined]
-        return stub_agent
+def test_initialise_tools_declares_every_tool_flag() -> None:
+    parameters = inspect.signature(deep_agent_module._initialise_tools).parameters
+    assert {spec.flag for spec in deep_agent_module._TOOL_SPECS} == set(parameters)
+    with pytest.raises(TypeError):
+        deep_agent_module._initialise_tools(include_shel=True)  # type: ignore[call-arg]
 
-    monkeypatch.setattr("tiangong_ai_workspace.agents.deep_agent.create_deep_agent", fake_create_deep_agent)
-    agent = build_workspace_deep_agent(
-        llm=dummy_model,
-        include_shell=False,
-        include_python=False,
-        include_tavily=False,
-        include_document_agent=False,
-        engine="deepagents",
-    )
-    assert agent is stub_agent
-    assert getattr(fake_create_deep_agent, "called", False)
-    assert "tools" in getattr(fake_create_deep_agent, "kwargs", {})
+
+def test_build_workspace_deep_agent_has_no_subagents_by_default(monkeypatch: pytest.MonkeyPatch, dummy_chat_model: BaseChatModel) -> None:
+    captured: dict[str, Any] = {}
+    monkeypatch.setattr(deep_agent_module, "create_deep_agent", lambda **kwargs: captured.update(kwargs))
+    build_workspace_deep_agent(llm=dummy_chat_model, include_shell=False, include_tavily=False, include_document_agent=False, engine="deepagents")
+    assert "tools" in captured
+    assert "subagents" not in captured
 
 
 class _StubNeo4jRecord:
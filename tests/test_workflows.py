@@ -1,38 +1,42 @@
-from __future__ import annotations
-
-from typing import Any, Iterable, List
+from collections import deque
+from dataclasses import replace
+from typing import Any, Iterable
+from unittest.mock import Mock
 
+import pytest
 from langchain_core.runnables import Runnable
 
 from tiangong_ai_workspace.agents import DocumentWorkflowConfig, DocumentWorkflowType, run_document_workflow
-from tiangong_ai_workspace.tooling.tavily import TavilySearchError
+from tiangong_ai_workspace.tooling.tavily import TavilySearchClient, TavilySearchError
+
+# Keep the workflow tests on one xdist worker so they share its warm LangGraph imports.
+pytestmark = pytest.mark.xdist_group("workflows")
+
+# Tests derive their variants with `dataclasses.replace`, so the template itself is never run or mutated.
+_BASE_CONFIG = DocumentWorkflowConfig(workflow=DocumentWorkflowType.REPORT, topic="测试主题", include_research=True)
 
 
 class SequentialLLM(Runnable):
     """Minimal Runnable that returns pre-seeded responses."""
 
     def __init__(self, responses: Iterable[str]) -> None:
-        self._responses: List[str] = list(responses)
+        self._responses: deque[str] = deque(responses)
 
     def invoke(self, _: Any, config: Any | None = None) -> str:  # type: ignore[override]
         if not self._responses:
             raise RuntimeError("SequentialLLM has no responses left")
-        return self._responses.pop(0)
+        return self._responses.popleft()
+
 
+def make_llm(*responses: str) -> SequentialLLM:
+    """Seed a :class:`SequentialLLM` straight from the argument tuple."""
 
-class FailingTavilyClient:
-    def search(self, _: str, *, options: Any | None = None) -> Any:
-        raise TavilySearchError("network unavailable")
+    return SequentialLLM(responses)
 
 
 def test_document_workflow_without_research() -> None:
-    llm = SequentialLLM(["OUTLINE", "DRAFT"])
-    config = DocumentWorkflowConfig(
-        workflow=DocumentWorkflowType.REPORT,
-        topic="测试主题",
-        include_research=False,
-        language="zh",
-    )
+    llm = make_llm("OUTLINE", "DRAFT")
+    config = replace(_BASE_CONFIG, include_research=False, language="zh")
     result = run_document_workflow(config, llm=llm)
     assert result["outline"] == "OUTLINE"
     assert result["draft"] == "DRAFT"
@@ -40,13 +44,11 @@ def test_document_workflow_without_research() -> None:
 
 
 def test_document_workflow_handles_research_failure() -> None:
-    llm = SequentialLLM(["OUTLINE", "DRAFT"])
-    config = DocumentWorkflowConfig(
-        workflow=DocumentWorkflowType.REPORT,
-        topic="测试主题",
-        include_research=True,
-    )
-    result = run_document_workflow(config, llm=llm, tavily=FailingTavilyClient())  # type: ignore[arg-type]
+    llm = make_llm("OUTLINE", "DRAFT")
+    failing = Mock(spec=TavilySearchClient)
+    failing.search.side_effect = TavilySearchError("network unavailable")
+    result = run_document_workflow(replace(_BASE_CONFIG), llm=llm, tavily=failing)
+    assert failing.search.call_count == 1
     assert result["outline"] == "OUTLINE"
     assert result["draft"] == "DRAFT"
     assert result["research"][0]["summary"] == "Research step failed"